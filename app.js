@@ -3,29 +3,188 @@ let currentFilter = 'all';
 let completedCourses = new Set(JSON.parse(localStorage.getItem('completedCourses') || '[]'));
 
 // Initialize the application
-document.addEventListener('DOMContentLoaded', () => {
-    renderCourses();
-    updateStats();
+document.addEventListener('DOMContentLoaded', async () => {
     setupEventListeners();
+    catalogSummary = await loadSummary();
+    updateStats();
+    renderCourses();
     const params = new URLSearchParams(window.location.search);
     if (params.has('autoTest')) {
         runAllCourseTests();
     }
 });
 
-// Render courses based on current filter
-function renderCourses(searchTerm = '') {
-    const grid = document.getElementById('coursesGrid');
-    const filteredCourses = courses.filter(course => {
-        const matchesFilter = currentFilter === 'all' || course.level === currentFilter;
-        const matchesSearch = searchTerm === '' || 
-            course.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-            course.description.toLowerCase().includes(searchTerm.toLowerCase()) ||
-            course.tags.some(tag => tag.toLowerCase().includes(searchTerm.toLowerCase()));
-        return matchesFilter && matchesSearch;
+// Catalog shards (catalog/summary.json and catalog/<level>.json, written by catalog_shards.py).
+// The summary alone is enough to lay out the grid; level shards are fetched when a
+// card from them scrolls into view
+let catalogSummary = null;
+const loadedShards = new Map();
+const shardRequests = new Map();
+const coursesById = new Map();
+
+function addShard(level, cards) {
+    loadedShards.set(level, cards);
+    cards.forEach(card => coursesById.set(card.id, card));
+}
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
     });
+}
+
+// Without shards (file:// pages, older builds) fall back to the full courses-data.js
+async function loadSummary() {
+    try {
+        const response = await fetch('catalog/summary.json');
+        if (response.ok) return await response.json();
+    } catch {}
+    await loadScript('courses-data.js');
+    const levels = [];
+    for (const course of courses) {
+        let entry = levels.find(l => l.level === course.level);
+        if (!entry) {
+            entry = { level: course.level, count: 0, hours: 0, shard: null };
+            levels.push(entry);
+            addShard(course.level, []);
+        }
+        entry.count++;
+        entry.hours += parseFloat(course.duration) || 0;
+        loadedShards.get(course.level).push(course);
+        coursesById.set(course.id, course);
+    }
+    return { total: courses.length, hours: levels.reduce((sum, l) => sum + l.hours, 0), levels };
+}
+
+function loadShard(level) {
+    if (!shardRequests.has(level)) {
+        const entry = catalogSummary.levels.find(l => l.level === level);
+        shardRequests.set(level, fetch(entry.shard)
+            .then(response => response.json())
+            .then(cards => addShard(level, cards)));
+    }
+    return shardRequests.get(level);
+}
+
+async function loadAllCourses() {
+    await Promise.all(catalogSummary.levels.map(l => loadedShards.has(l.level) || loadShard(l.level)));
+    return catalogSummary.levels.flatMap(l => loadedShards.get(l.level));
+}
+
+// Prebuilt search index (search-index.json, written by search_index.py), fetched on first search
+let searchIndex = null;
+let searchIndexRequest = null;
+let searchGeneration = 0;
+
+function loadSearchIndex() {
+    if (!searchIndexRequest) {
+        searchIndexRequest = fetch('search-index.json')
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null)
+            .then(index => {
+                searchIndex = index;
+                return index;
+            });
+    }
+    return searchIndexRequest;
+}
+
+// Must match tokenize() in search_index.py
+function tokenize(text) {
+    return text.toLowerCase().match(/[a-z0-9]+/g) || [];
+}
+
+// Ids of courses matching every query word as a term prefix, or null without an index
+function searchCourseIds(index, searchTerm) {
+    let result = null;
+    for (const word of tokenize(searchTerm)) {
+        const terms = index.terms;
+        // Binary search for the first term >= word, then walk terms sharing the prefix
+        let lo = 0, hi = terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (terms[mid] < word) lo = mid + 1; else hi = mid;
+        }
+        const matches = new Set();
+        for (let i = lo; i < terms.length && terms[i].startsWith(word); i++) {
+            let id = 0;
+            for (const gap of index.postings[i]) {
+                id += gap;
+                if (result === null || result.has(id)) matches.add(id);
+            }
+        }
+        result = matches;
+        if (result.size === 0) break;
+    }
+    return result;
+}
 
-    grid.innerHTML = filteredCourses.map(course => `
+// Linear substring scan, used when search-index.json cannot be fetched (e.g. file://)
+function scanCourses(allCourses, searchTerm) {
+    const term = searchTerm.toLowerCase();
+    return allCourses.filter(course =>
+        course.title.toLowerCase().includes(term) ||
+        course.description.toLowerCase().includes(term) ||
+        course.tags.some(tag => tag.toLowerCase().includes(term)));
+}
+
+// What the grid shows: `count` cards, `cardAt(i)` returning null until its shard arrives
+let gridView = { count: 0, cardAt: () => null };
+
+function levelView(levels) {
+    const entries = catalogSummary.levels.filter(l => levels.includes(l.level));
+    return {
+        count: entries.reduce((sum, l) => sum + l.count, 0),
+        cardAt(i) {
+            for (const entry of entries) {
+                if (i < entry.count) {
+                    const cards = loadedShards.get(entry.level);
+                    if (cards) return cards[i];
+                    loadShard(entry.level).then(scheduleGridRender);
+                    return null;
+                }
+                i -= entry.count;
+            }
+            return null;
+        }
+    };
+}
+
+function listView(cards) {
+    return { count: cards.length, cardAt: i => cards[i] };
+}
+
+// Render courses based on current filter
+async function renderCourses(searchTerm = '') {
+    if (!catalogSummary) return;
+    const generation = ++searchGeneration;
+    if (tokenize(searchTerm).length === 0) {
+        const levels = currentFilter === 'all' ? catalogSummary.levels.map(l => l.level) : [currentFilter];
+        gridView = levelView(levels);
+    } else {
+        const [index, allCourses] = await Promise.all([searchIndex || loadSearchIndex(), loadAllCourses()]);
+        // A newer keystroke has started its own render
+        if (generation !== searchGeneration) return;
+        let matched;
+        if (index) {
+            const ids = [...searchCourseIds(index, searchTerm)].sort((a, b) => a - b);
+            matched = ids.map(id => coursesById.get(id)).filter(Boolean);
+        } else {
+            matched = scanCourses(allCourses, searchTerm);
+        }
+        gridView = listView(currentFilter === 'all' ? matched : matched.filter(course => course.level === currentFilter));
+    }
+    window.scrollTo({ top: Math.min(window.scrollY, document.getElementById('coursesGrid').offsetTop) });
+    renderGridWindow();
+}
+
+function courseCardHtml(course) {
+    if (!course) return '<div class="course-card"></div>';
+    return `
         <div class="course-card" onclick="openCourse(${course.id})">
             <span class="course-number">Course ${course.id}</span>
             ${completedCourses.has(course.id) ? '<span style="float:right">✅</span>' : ''}
@@ -39,7 +198,50 @@ function renderCourses(searchTerm = '') {
                 ${course.tags.map(tag => `<span class="tag">${tag}</span>`).join('')}
             </div>
         </div>
-    `).join('');
+    `;
+}
+
+// Virtual scrolling: only rows near the viewport are in the DOM; padding stands in for the rest
+const GRID_OVERSCAN_ROWS = 3;
+let gridRowHeight = 0;
+let gridRenderPending = false;
+
+function scheduleGridRender() {
+    if (gridRenderPending) return;
+    gridRenderPending = true;
+    requestAnimationFrame(() => {
+        gridRenderPending = false;
+        renderGridWindow();
+    });
+}
+
+function renderGridWindow() {
+    const grid = document.getElementById('coursesGrid');
+    const style = getComputedStyle(grid);
+    const columns = Math.max(1, style.gridTemplateColumns.split(' ').length);
+    const gap = parseFloat(style.rowGap) || 0;
+    const rows = Math.ceil(gridView.count / columns);
+    // Until a row has been measured, guess generously so the first window covers the viewport
+    const pitch = (gridRowHeight || 250) + gap;
+
+    const top = window.scrollY - (grid.getBoundingClientRect().top + window.scrollY);
+    const firstRow = Math.max(0, Math.min(rows, Math.floor(top / pitch) - GRID_OVERSCAN_ROWS));
+    const lastRow = Math.min(rows, Math.ceil((top + window.innerHeight) / pitch) + GRID_OVERSCAN_ROWS);
+
+    const html = [];
+    for (let i = firstRow * columns; i < Math.min(gridView.count, lastRow * columns); i++) {
+        html.push(courseCardHtml(gridView.cardAt(i)));
+    }
+    grid.style.paddingTop = `${firstRow * pitch}px`;
+    grid.style.paddingBottom = `${Math.max(0, rows - lastRow) * pitch}px`;
+    grid.innerHTML = html.join('');
+
+    if (!gridRowHeight && grid.firstElementChild && gridView.cardAt(0)) {
+        // Fix every row to the tallest rendered card so row offsets can be computed
+        gridRowHeight = Math.max(...[...grid.children].map(card => card.offsetHeight));
+        grid.style.gridAutoRows = `${gridRowHeight}px`;
+        renderGridWindow();
+    }
 }
 
 // Setup event listeners
@@ -59,6 +261,13 @@ function setupEventListeners() {
         renderCourses(e.target.value);
     });
 
+    window.addEventListener('scroll', scheduleGridRender, { passive: true });
+    window.addEventListener('resize', () => {
+        gridRowHeight = 0;
+        document.getElementById('coursesGrid').style.gridAutoRows = '';
+        scheduleGridRender();
+    });
+
     const runBtn = document.getElementById('runTestsBtn');
     if (runBtn) {
         runBtn.addEventListener('click', () => {
@@ -69,7 +278,7 @@ function setupEventListeners() {
 
 // Open a course
 function openCourse(courseId) {
-    const course = courses.find(c => c.id === courseId);
+    const course = coursesById.get(courseId);
     if (course) {
         window.location.href = `${course.folder}/index.html`;
     }
@@ -84,10 +293,13 @@ function markComplete(courseId) {
 
 // Update statistics
 function updateStats() {
+    if (!catalogSummary) return;
     const completed = completedCourses.size;
-    const total = courses.length;
+    const total = catalogSummary.total;
     const percentage = Math.round((completed / total) * 100);
     
+    document.getElementById('totalCourses').textContent = total;
+    document.getElementById('estimatedTime').textContent = `${Math.round(catalogSummary.hours)}h`;
     document.getElementById('completedCourses').textContent = completed;
     document.getElementById('progressFill').style.width = `${percentage}%`;
     document.getElementById('progressFill').textContent = `${percentage}% Complete`;
@@ -111,7 +323,7 @@ async function runAllCourseTests() {
     if (summaryEl) summaryEl.textContent = 'Running...';
     let passed = 0;
     let failed = 0;
-    for (const course of courses) {
+    for (const course of await loadAllCourses()) {
         const iframe = document.createElement('iframe');
         iframe.style.width = '0px';
         iframe.style.height = '0px';
@@ -0,0 +1,37 @@
+"""
+Crash-safe file writes shared by the build modules
+Outputs are written to a temp file beside their target, named with the writer's pid so
+concurrent pool workers never collide, and renamed over it: readers see the old bytes
+or the new ones, never a partial file, and a file hard-linked from the live generation
+(see publish.py) is replaced rather than changed in place
+"""
+
+import os
+
+
+def temp_path(path):
+    """Temp file name for writing `path` from this process, for os.replace() into place"""
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def write_atomic(path, data):
+    """Write bytes to a file via temp file and rename"""
+    tmp_path = temp_path(path)
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path, data):
+    """Write bytes atomically unless the file already holds them, returning True if written
+
+    Unchanged files keep their mtime, so no-op builds leave nothing to sync.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, data)
+    return True
@@ -0,0 +1,67 @@
+"""
+Benchmark per-course content lookup in build_all_courses
+Measures time and tracemalloc peak per get_course_content + create_demo_js call,
+the per-course cost that scales with catalog size
+
+Usage: python benchmarks/bench_content.py [--courses N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_all_courses
+
+
+def lookup(course_id):
+    """The content work done for one course"""
+    content = build_all_courses.get_course_content(course_id, f"Synthetic Course {course_id}", 'beginner')
+    return build_all_courses.create_demo_js(course_id, content['demo_type'])
+
+
+def measure_time(course_ids):
+    """Average microseconds per course"""
+    start = time.perf_counter()
+    for course_id in course_ids:
+        lookup(course_id)
+    return (time.perf_counter() - start) / len(course_ids) * 1e6
+
+
+def measure_allocations(course_ids):
+    """Average and max tracemalloc peak above baseline per course, in bytes"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for course_id in course_ids:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            lookup(course_id)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks), max(peaks)
+
+
+def main(argv=None):
+    """Run the content lookup benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark per-course content lookup")
+    parser.add_argument('--courses', type=int, default=10000, help="number of course ids (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    course_ids = list(range(1, args.courses + 1))
+    lookup(1)  # warm up lazily built registries
+    per_course_us = measure_time(course_ids)
+    avg_peak, max_peak = measure_allocations(course_ids)
+
+    print(f"📚 {args.courses} courses")
+    print(f"⏱️ {per_course_us:.2f} µs per course")
+    print(f"🧠 {avg_peak / 1024:.2f} KB average peak allocation per course ({max_peak / 1024:.2f} KB max)")
+
+
+if __name__ == '__main__':
+    main()
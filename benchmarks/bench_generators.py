@@ -0,0 +1,264 @@
+"""
+Benchmark the three course generators against synthetic catalogs
+Writes a synthetic courses-data.js of each size into a temp dir, plus a content store
+giving every course theory and app fragments sized like those in content/, runs every
+generator there in a fresh process and reports wall time, peak RSS, files and bytes written
+
+Usage: python benchmarks/bench_generators.py [--sizes 100,1000] [--jobs N] [--json out.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import itertools
+import shutil
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import content_store
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+LEVELS = ['beginner', 'intermediate', 'advanced', 'expert', 'master']
+TOPICS = ['Retrieval', 'Planning', 'Memory', 'Tool Use', 'Evaluation', 'Routing', 'Reflection',
+          'Multi-Agent', 'Streaming', 'Caching', 'Security', 'Observability', 'Fine-Tuning']
+KINDS = ['Agent', 'Systems', 'Patterns', 'Pipelines', 'Fundamentals', 'in Production']
+
+
+def synthetic_course(course_id, total):
+    """Build one catalog record with field sizes similar to courses-data.js"""
+    topic = TOPICS[course_id % len(TOPICS)]
+    kind = KINDS[(course_id // len(TOPICS)) % len(KINDS)]
+    title = f"{topic} {kind} {course_id}"
+    slug = title.lower().replace(' ', '_').replace('-', '_')
+    return {
+        'id': course_id,
+        'title': title,
+        'description': f"Build and evaluate {topic.lower()} {kind.lower()} with hands-on demos and metrics.",
+        'level': LEVELS[min((course_id - 1) * len(LEVELS) // total, len(LEVELS) - 1)],
+        'tags': [topic.lower().replace(' ', '-'), kind.split()[-1].lower()],
+        'folder': f"course_{course_id:03d}_{slug}",
+        'duration': f"{1 + course_id % 5}h",
+    }
+
+
+def load_samples(root=content_store.CONTENT_DIR):
+    """{(store, section): [(entry, fragment text)]} from a real content store"""
+    source = content_store.ContentStore(root)
+    samples = {}
+    for store in source.index:
+        for course_id in source.ids(store):
+            entry = source.entry(store, course_id)
+            for section in entry['sections']:
+                text = source.read_text(store, course_id, section)
+                samples.setdefault((store, section), []).append((entry, text))
+    return samples
+
+
+def synthetic_fragment(relpath, text, rng):
+    """Fragment text for one course modelled on a real fragment
+
+    HTML is cut or extended line by line to 70-130% of the real size; code is kept
+    whole, since cutting it would not parse.
+    """
+    if not relpath.endswith('.html'):
+        return text
+    target = int(len(text) * rng.uniform(0.7, 1.3))
+    lines = itertools.cycle(text.splitlines(keepends=True))
+    parts = []
+    length = 0
+    while length < target:
+        line = next(lines)
+        parts.append(line)
+        length += len(line)
+    return ''.join(parts)
+
+
+def write_synthetic_content(root, size, samples=None):
+    """Write a content store with build, courses and apps entries for `size` synthetic courses
+
+    Each fragment is modelled on a randomly chosen real fragment of the same section, so
+    theory and app code sizes follow the distribution of the real content/ store.
+    """
+    samples = samples if samples is not None else load_samples()
+    index = {}
+    for course_id in range(1, size + 1):
+        record = synthetic_course(course_id, size)
+        rng = random.Random(course_id)
+        entries = {}
+        for (store, section), choices in sorted(samples.items()):
+            entry, text = rng.choice(choices)
+            relpath = f"{store}/{course_id:03d}/{section}{os.path.splitext(entry['sections'][section])[1]}"
+            path = os.path.join(root, relpath)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(synthetic_fragment(relpath, text, rng))
+            fields = {key: value for key, value in entry.items() if key != 'sections'}
+            for key in ('title', 'level'):
+                if key in fields:
+                    fields[key] = record[key]
+            entries.setdefault(store, dict(fields, sections={}))['sections'][section] = relpath
+        for store, entry in entries.items():
+            index.setdefault(store, {})[str(course_id)] = entry
+    with open(os.path.join(root, content_store.INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+
+def write_synthetic_catalog(path, size):
+    """Write a courses-data.js with `size` synthetic courses"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("// Synthetic course catalog for benchmarks\nconst courses = [\n")
+        for course_id in range(1, size + 1):
+            record = synthetic_course(course_id, size)
+            fields = ', '.join(f"{key}: {json.dumps(value)}" for key, value in record.items())
+            f.write(f"    {{{fields}}},\n")
+        f.write("];\n")
+
+
+def snapshot(root):
+    """Map every file under root to (size, mtime_ns)"""
+    files = {}
+    for folder, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            stat = os.stat(path)
+            files[path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KB on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_generator(name, base_path, jobs):
+    """Run one generator in base_path with stdout silenced"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if name == 'build_all_courses':
+            import build_all_courses
+            build_all_courses.main(['--base-path', base_path, '--jobs', str(jobs)])
+        elif name == 'build_pipeline':
+            import build_pipeline
+            build_pipeline.main(['--base-path', base_path, '--jobs', str(jobs)])
+        elif name == 'generate_courses':
+            import generate_courses
+            generate_courses.generate_all_courses(base_path)
+        elif name == 'generate_course_apps':
+            import generate_course_apps
+            generate_course_apps.main(base_path)
+        else:
+            raise ValueError(f"Unknown generator {name!r}")
+
+
+def _child(name, base_path, jobs, queue):
+    """Process entry point: time one generator run and report its stats"""
+    before = snapshot(base_path)
+    start = time.perf_counter()
+    run_generator(name, base_path, jobs)
+    wall = time.perf_counter() - start
+    after = snapshot(base_path)
+
+    written = [path for path, stat in after.items() if before.get(path) != stat]
+    queue.put({
+        'wall_s': wall,
+        'peak_rss_kb': peak_rss_kb(),
+        'files_written': len(written),
+        'bytes_written': sum(after[path][0] for path in written),
+    })
+
+
+def measure(name, base_path, jobs):
+    """Run a generator in a fresh process so peak RSS covers only that run"""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(name, base_path, jobs, queue))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"{name} exited with code {process.exitcode}")
+    return queue.get()
+
+
+# Order matters: generate_course_apps needs the folders build_all_courses creates
+RUNS = [
+    ('build_all_courses', 'build_all_courses'),
+    ('build_all_courses (warm)', 'build_all_courses'),
+    ('generate_courses', 'generate_courses'),
+    ('generate_course_apps', 'generate_course_apps'),
+    ('build_pipeline', 'build_pipeline'),
+    ('build_pipeline (warm)', 'build_pipeline'),
+]
+
+
+def run_suite(sizes, jobs=1, keep=False):
+    """Benchmark every generator at every catalog size, returning a list of result rows"""
+    results = []
+    samples = load_samples()
+    for size in sizes:
+        base_path = tempfile.mkdtemp(prefix=f'course-bench-{size}-')
+        content_dir = tempfile.mkdtemp(prefix=f'course-bench-content-{size}-')
+        try:
+            write_synthetic_catalog(os.path.join(base_path, 'courses-data.js'), size)
+            write_synthetic_content(content_dir, size, samples)
+            # Generator processes, and their pool workers, read content from here
+            os.environ['COURSE_CONTENT_DIR'] = content_dir
+            for label, name in RUNS:
+                stats = measure(name, base_path, jobs)
+                row = {'generator': label, 'courses': size, 'jobs': jobs, **stats}
+                results.append(row)
+                print_row(row)
+        finally:
+            if keep:
+                print(f"📁 Kept {base_path}")
+            else:
+                shutil.rmtree(base_path, ignore_errors=True)
+            shutil.rmtree(content_dir, ignore_errors=True)
+            os.environ.pop('COURSE_CONTENT_DIR', None)
+    return results
+
+
+def print_row(row):
+    """Print one result line"""
+    rss = f"{row['peak_rss_kb'] / 1024:8.1f} MB" if row['peak_rss_kb'] is not None else "     n/a"
+    print(f"{row['generator']:<26} {row['courses']:>7} {row['wall_s']:>9.3f}s {rss} "
+          f"{row['files_written']:>8} files {row['bytes_written'] / 1024:>11.1f} KB")
+
+
+def main(argv=None):
+    """Parse options and run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark the course generators on synthetic catalogs")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated catalog sizes (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="--jobs passed to build_all_courses and build_pipeline")
+    parser.add_argument('--json', help="also write results to this JSON file")
+    parser.add_argument('--keep', action='store_true', help="keep the temp output directories")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    print(f"{'generator':<26} {'courses':>7} {'wall':>10} {'peak RSS':>11} {'written':>14} {'bytes':>14}")
+    print("-" * 88)
+    results = run_suite(sizes, args.jobs, args.keep)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
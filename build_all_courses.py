@@ -4,185 +4,18 @@ Each course includes complete HTML, JS with interactive demos and visualizations
 """
 
 import os
-import json
+import re
+import hashlib
 
-def get_course_content(course_id, title, level):
-    """Generate comprehensive content for each course"""
-    
-    # Define content templates based on course categories
-    content_map = {
-        # BEGINNER COURSES (1-20)
-        1: {
-            "theory": """
-                <h1>Introduction to AI Agents</h1>
-                <h2>What is an AI Agent?</h2>
-                <p>An AI agent is an autonomous entity that perceives its environment through sensors and acts upon it through actuators to achieve specific goals.</p>
-                
-                <h3>Key Components</h3>
-                <ul>
-                    <li><strong>Perception:</strong> Ability to sense and understand the environment</li>
-                    <li><strong>Reasoning:</strong> Processing information to make decisions</li>
-                    <li><strong>Action:</strong> Executing decisions in the environment</li>
-                    <li><strong>Learning:</strong> Improving performance over time</li>
-                </ul>
-                
-                <h2>Agent Architecture Types</h2>
-                <div class="info-box">
-                    <h4>1. Simple Reflex Agent</h4>
-                    <p>Acts based on current perception only, using condition-action rules.</p>
-                    <div class="code-block">if perception == "obstacle" then action = "avoid"</div>
-                    
-                    <h4>2. Model-Based Reflex Agent</h4>
-                    <p>Maintains internal state of the world to handle partial observability.</p>
-                    
-                    <h4>3. Goal-Based Agent</h4>
-                    <p>Acts to achieve specific goals, considering future consequences.</p>
-                    
-                    <h4>4. Utility-Based Agent</h4>
-                    <p>Maximizes expected utility, handling trade-offs between conflicting goals.</p>
-                </div>
-                
-                <h2>PEAS Framework</h2>
-                <p>To design an agent, we must specify:</p>
-                <ul>
-                    <li><strong>Performance Measure:</strong> How we evaluate success</li>
-                    <li><strong>Environment:</strong> The world the agent operates in</li>
-                    <li><strong>Actuators:</strong> How the agent affects the environment</li>
-                    <li><strong>Sensors:</strong> How the agent perceives the environment</li>
-                </ul>
-                
-                <h2>Agent Properties</h2>
-                <div class="success-box">
-                    <ul>
-                        <li><strong>Autonomy:</strong> Operates without direct human intervention</li>
-                        <li><strong>Reactivity:</strong> Responds to environmental changes in real-time</li>
-                        <li><strong>Proactivity:</strong> Takes initiative to achieve goals</li>
-                        <li><strong>Social Ability:</strong> Interacts with other agents and humans</li>
-                    </ul>
-                </div>
-                
-                <h2>Environment Types</h2>
-                <table style="width:100%; border-collapse: collapse; margin: 20px 0;">
-                    <tr style="background: #667eea; color: white;">
-                        <th style="padding: 10px; border: 1px solid #ddd;">Property</th>
-                        <th style="padding: 10px; border: 1px solid #ddd;">Types</th>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Observability</td>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Fully Observable vs Partially Observable</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Determinism</td>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Deterministic vs Stochastic</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Episodes</td>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Episodic vs Sequential</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Dynamics</td>
-                        <td style="padding: 10px; border: 1px solid #ddd;">Static vs Dynamic</td>
-                    </tr>
-                </table>
-            """,
-            "demo_type": "simple_agent"
-        },
-        2: {
-            "theory": """
-                <h1>Prompt Engineering Fundamentals</h1>
-                <h2>What is Prompt Engineering?</h2>
-                <p>Prompt engineering is the art and science of crafting effective instructions for Large Language Models (LLMs) to generate desired outputs.</p>
-                
-                <h2>Core Principles</h2>
-                <h3>1. Clarity and Specificity</h3>
-                <p>Be explicit about what you want. Vague prompts lead to unpredictable results.</p>
-                <div class="code-block">❌ Bad: "Write about dogs"
-✅ Good: "Write a 200-word informative paragraph about Golden Retrievers, 
-focusing on their temperament and suitability as family pets."</div>
-                
-                <h3>2. Context Provision</h3>
-                <p>Provide relevant background information to guide the model.</p>
-                <div class="code-block">Context: You are analyzing customer reviews for a restaurant.
-Task: Classify the following review as positive, negative, or neutral.
-Review: "The food was okay, but the service was slow."</div>
-                
-                <h3>3. Format Specification</h3>
-                <p>Clearly define the desired output format (JSON, bullet points, essay, etc.)</p>
-                
-                <h2>Advanced Techniques</h2>
-                <h3>Few-Shot Learning</h3>
-                <p>Provide examples of input-output pairs to guide the model's behavior.</p>
-                <div class="code-block">Example 1:
-Input: "The movie was fantastic!"
-Output: Positive
-
-Example 2:
-Input: "I hated every minute of it."
-Output: Negative
-
-Example 3:
-Input: "It was okay, nothing special."
-Output: Neutral
-
-Now classify: "Best film I've seen this year!"</div>
-                
-                <h3>Chain-of-Thought (CoT)</h3>
-                <p>Encourage step-by-step reasoning by asking the model to "think through" problems.</p>
-                <div class="code-block">Problem: If a train travels 120 miles in 2 hours, how far will it travel in 5 hours?
-
-Let's solve this step by step:
-1. First, calculate the speed: 120 miles ÷ 2 hours = 60 mph
-2. Then, multiply by the new time: 60 mph × 5 hours = 300 miles
-3. Answer: 300 miles</div>
-                
-                <h3>Role Assignment</h3>
-                <p>Assign a specific role or persona to the model for better context.</p>
-                <div class="code-block">You are an expert Python developer with 10 years of experience 
-in data science. Explain list comprehensions to a beginner 
-programmer who knows basic Python syntax.</div>
-                
-                <h2>Prompt Components</h2>
-                <div class="info-box">
-                    <ul>
-                        <li><strong>Instruction:</strong> The task you want performed</li>
-                        <li><strong>Context:</strong> Background information</li>
-                        <li><strong>Input Data:</strong> The specific data to process</li>
-                        <li><strong>Output Indicator:</strong> Format specification</li>
-                    </ul>
-                </div>
-                
-                <h2>Best Practices</h2>
-                <ul>
-                    <li>✅ Start simple, then iterate based on results</li>
-                    <li>✅ Use delimiters (###, """, ---) to separate sections</li>
-                    <li>✅ Specify constraints (length, tone, style, format)</li>
-                    <li>✅ Test with edge cases and unexpected inputs</li>
-                    <li>✅ Version control your prompts for reproducibility</li>
-                    <li>✅ Use temperature and top_p parameters appropriately</li>
-                    <li>❌ Don't assume the model has real-time information</li>
-                    <li>❌ Don't rely on implicit understanding</li>
-                </ul>
-                
-                <h2>Common Pitfalls</h2>
-                <div class="warning-box">
-                    <ul>
-                        <li><strong>Ambiguity:</strong> Unclear instructions lead to varied outputs</li>
-                        <li><strong>Overcomplication:</strong> Too many instructions can confuse the model</li>
-                        <li><strong>Lack of Examples:</strong> Complex tasks benefit from demonstrations</li>
-                        <li><strong>Ignoring Token Limits:</strong> Prompts that are too long get truncated</li>
-                    </ul>
-                </div>
-            """,
-            "demo_type": "prompt_tester"
-        }
-    }
-    
-    # Default content for courses not yet detailed
-    default_content = {
-        "theory": f"""
+from course_catalog import CATALOG_PATH, load_catalog
+from course_folders import resolve_folder
+from content_store import default_store
+
+# Default theory for courses not yet detailed; only the title is filled in per course
+DEFAULT_THEORY = """
             <h1>{title}</h1>
             <h2>Course Overview</h2>
-            <p>This course covers {title.lower()}, a crucial topic in agentic AI systems.</p>
+            <p>This course covers {title_lower}, a crucial topic in agentic AI systems.</p>
             
             <h2>Learning Objectives</h2>
             <ul>
@@ -208,14 +41,37 @@ programmer who knows basic Python syntax.</div>
                 <li>Enterprise applications</li>
                 <li>Autonomous systems</li>
             </ul>
-        """,
-        "demo_type": "generic"
-    }
+        """
+
+# DEFAULT_THEORY split once around its two fields, so a render is one join rather
+# than str.format re-parsing 1.5 KB of template per course
+_THEORY_HEAD, _THEORY_MID, _THEORY_TAIL = re.split(r'\{title\}|\{title_lower\}', DEFAULT_THEORY)
+
+# Lazily built demo registry shared by every call; treat it as read-only
+_demos = None
+
+def get_course_content(course_id, title, level):
+    """Generate comprehensive content for each course
     
-    return content_map.get(course_id, default_content)
+    Detailed theory lives in content/build/ and is read only when the course renders.
+    """
+    store = default_store()
+    entry = store.entry('build', course_id)
+    if entry is not None:
+        return {"theory": store.read_text('build', course_id, 'theory'), "demo_type": entry['demo_type']}
+    theory = ''.join((_THEORY_HEAD, title, _THEORY_MID, title.lower(), _THEORY_TAIL))
+    return {"theory": theory, "demo_type": "generic"}
 
 def create_demo_js(course_id, demo_type):
     """Generate JavaScript for interactive demos"""
+    global _demos
+    if _demos is None:
+        _demos = _build_demos()
+    
+    return _demos.get(demo_type, _demos["generic"])
+
+def _build_demos():
+    """Build the demo JavaScript registry, once per process"""
     
     demos = {
         "simple_agent": """
@@ -551,128 +407,34 @@ function runDemo() {
 """
     };
     
-    return demos.get(demo_type, demos["generic"])
+    return demos
 
-def create_course_files(course_id, title, level):
-    """Create all files for a course"""
-    base_path = "c:/Users/wjbea/Downloads/learnbydoingwithsteven/agentic_sys_0-1"
-    
-    # Create folder name
-    folder_name = f"course_{course_id:03d}_{title.lower().replace(' ', '_').replace('&', 'and').replace('-', '_')[:40]}"
-    course_path = os.path.join(base_path, folder_name)
-    
-    os.makedirs(course_path, exist_ok=True)
-    
-    # Get content
-    content = get_course_content(course_id, title, level)
-    
-    # Create HTML
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Course {course_id}: {title}</title>
-    <link rel="stylesheet" href="../shared/course-styles.css">
-    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-</head>
-<body>
-    <nav class="navbar">
-        <a href="../index.html" class="back-btn">← Back to Courses</a>
-        <h2>Course {course_id}: {title}</h2>
-        <button class="complete-btn" onclick="markCourseComplete()">Mark Complete ✓</button>
-    </nav>
-
-    <div class="container">
-        <div class="sidebar">
-            <div class="course-info">
-                <h3>Course {course_id}</h3>
-                <p class="level-badge level-{level}">{level.upper()}</p>
-                <p class="duration">⏱️ 2h</p>
-            </div>
-            
-            <div class="toc">
-                <h4>📚 Contents</h4>
-                <ul id="tocList"></ul>
-            </div>
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+DEMOS_DIR = "shared/demos"
 
-            <div class="progress-section">
-                <h4>📈 Progress</h4>
-                <div class="progress-bar">
-                    <div class="progress-fill" id="sectionProgress">0%</div>
-                </div>
-            </div>
-        </div>
+# Per-course course.js is only this config; the demo itself is a shared module
+COURSE_CONFIG_JS = "// Course {course_id}: {title}\nwindow.courseConfig = {config};\n"
 
-        <main class="content" id="courseContent">
-            {content['theory']}
-        </main>
-
-        <aside class="demo-panel">
-            <h3>🚀 Interactive Demo</h3>
-            <div id="demoControls"></div>
-            <div id="demoOutput"></div>
-            <div id="demoVisuals"></div>
-        </aside>
-    </div>
-
-    <script src="../shared/course-utils.js"></script>
-    <script src="course.js"></script>
-</body>
-</html>"""
-    
-    with open(os.path.join(course_path, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    # Create JS
-    js_content = create_demo_js(course_id, content['demo_type'])
-    with open(os.path.join(course_path, 'course.js'), 'w', encoding='utf-8') as f:
-        f.write(js_content)
-    
-    return folder_name
+def course_folder_name(course_id, title):
+    """Build the output folder name for a course"""
+    return resolve_folder({'id': course_id, 'title': title})
 
-# Load course data from courses-data.js
-import re
+def demo_module_path(data):
+    """Content-addressed path of a shared demo module, relative to the output root"""
+    return f"{DEMOS_DIR}/{hashlib.sha256(data).hexdigest()[:16]}.js"
 
-def load_courses_from_js():
-    """Parse courses from courses-data.js"""
-    js_path = "c:/Users/wjbea/Downloads/learnbydoingwithsteven/agentic_sys_0-1/courses-data.js"
-    
-    with open(js_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract course objects using regex
-    pattern = r'\{id:\s*(\d+),\s*title:\s*"([^"]+)",.*?level:\s*"([^"]+)"'
-    matches = re.findall(pattern, content)
-    
-    courses = []
-    for match in matches:
-        courses.append({
-            'id': int(match[0]),
-            'title': match[1],
-            'level': match[2]
-        })
-    
-    return courses
+def load_courses_from_js(js_path=CATALOG_PATH):
+    """Load every course record from courses-data.js"""
+    return load_catalog(js_path)
 
-def main():
-    """Generate all 100 courses"""
-    print("🚀 Starting course generation...")
-    print("=" * 60)
-    
-    courses = load_courses_from_js()
-    
-    for i, course in enumerate(courses, 1):
-        try:
-            folder = create_course_files(course['id'], course['title'], course['level'])
-            print(f"✅ [{i}/100] Course {course['id']}: {course['title']}")
-        except Exception as e:
-            print(f"❌ [{i}/100] Error creating course {course['id']}: {e}")
+def main(argv=None):
+    """Generate all 100 courses: index.html, course.js and shared demo modules
     
-    print("=" * 60)
-    print(f"🎉 Successfully generated {len(courses)} courses!")
-    print(f"📁 Location: c:/Users/wjbea/Downloads/learnbydoingwithsteven/agentic_sys_0-1/")
+    Rendering, the incremental manifest, --jobs and --profile live in build_pipeline;
+    this entry point runs it without the app.js stage.
+    """
+    import build_pipeline
+    build_pipeline.main(argv, apps=False)
 
 if __name__ == '__main__':
     main()
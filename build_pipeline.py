@@ -0,0 +1,771 @@
+"""
+Single streaming build pipeline for every generated course file
+Each catalog record is parsed once and flows through the same stages:
+resolve slug -> render index.html -> render course.js -> render app.js -> write.
+The pipeline also owns the incremental build manifest, the --jobs process pool
+and --profile tracing, so one run is one pass over the catalog and the filesystem
+
+Usage: python build_pipeline.py [--jobs N] [--profile trace.json] [--no-apps] [--minify] [--precompress] [--watch]
+                                [--shard I/N] [--render-cache DIR [--render-cache-size SIZE]]
+                                [--report build.json] [--metrics build.prom]
+                                [--reproducible] [--delta-bundle BUNDLE]
+                                [--release-root DIR [--staging-dir DIR]]
+                                [--archive site.zip [--staging-dir DIR]]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import shutil
+import argparse
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import minify as minify_module
+import render_cache as render_cache_module
+import publish
+import site_archive
+import build_trace
+import build_report
+import precompress
+import delta_bundle
+import search_index
+import catalog_shards
+import build_all_courses
+import generate_course_apps
+from atomic_io import write_atomic
+from course_catalog import load_catalog
+from course_folders import build_folder_index, report_folder_problems, resolve_folder
+from content_store import default_store
+from shared_assets import publish_shared_assets, remove_unused_assets, asset_urls
+from course_template import load_template, course_page_values, detect_chart_libraries, chart_script_tags, CHART_LIBRARIES
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = ".build-manifest.json"
+
+
+class DirectoryOutput:
+    """Writes build outputs under a root directory, addressed by '/'-separated paths"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, relpath):
+        """Absolute path for an output-relative path"""
+        return os.path.join(self.root, *relpath.split('/'))
+
+    def size(self, relpath):
+        """Size of an existing output file, or None if it is missing"""
+        try:
+            return os.path.getsize(self.path(relpath))
+        except OSError:
+            return None
+
+    def write(self, relpath, data):
+        """Write one output file by temp file and rename (see atomic_io.py)"""
+        path = self.path(relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, data)
+
+    def write_shared(self, relpath, data):
+        """Write a content-addressed file unless it already exists, returning True if written
+
+        Concurrent pool workers writing the same module never expose a partial file.
+        """
+        if self.size(relpath) == len(data):
+            return False
+        path = self.path(relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, data)
+        return True
+
+    def remove(self, relpath):
+        """Delete an output file if present"""
+        try:
+            os.remove(self.path(relpath))
+        except FileNotFoundError:
+            pass
+
+    def remove_dir(self, relpath):
+        """Delete an output directory if it is empty"""
+        try:
+            os.rmdir(self.path(relpath))
+        except OSError:
+            pass
+
+    def list_dir(self, relpath):
+        """Names in an output directory, or [] if it does not exist"""
+        try:
+            return sorted(os.listdir(self.path(relpath)))
+        except FileNotFoundError:
+            return []
+
+    def drain(self):
+        """Nothing is queued: files are written as they are rendered"""
+        return []
+
+
+class BuildContext:
+    """Settings shared by every record in a build; picklable for pool workers"""
+
+    def __init__(self, base_path=BASE_PATH, apps=True, profile=False, minify=False, vendored_charts=False,
+                 urls=None, render_cache=None):
+        self.base_path = base_path
+        # Shared asset URLs for course pages, fingerprinted by publish_shared_assets()
+        self.urls = urls or asset_urls()
+        self.apps = apps
+        self.profile = profile
+        self.vendored_charts = vendored_charts
+        self.output = DirectoryOutput(base_path)
+        self.minify_cache = minify_module.MinifyCache(os.path.join(base_path, minify_module.CACHE_DIR)) if minify else None
+        # A render_cache_module.RenderCache shared across builds, and the code version keying it
+        self.render_cache = render_cache
+        self.generator = render_cache_module.generator_version() if render_cache else None
+        self.stages = [resolve_slug]
+        if render_cache:
+            self.stages.append(fetch_rendered)
+        self.stages += [render_index, render_course_js]
+        if apps:
+            self.stages.append(render_app_js)
+        if minify:
+            self.stages.append(minify_outputs)
+        if render_cache:
+            self.stages.append(store_rendered)
+        self.stages.append(write_outputs)
+
+
+def hash_parts(parts):
+    """Return a sha256 hex digest over a list of str/bytes parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+# ---- Stages: each takes the in-flight item dict and the build context ----
+
+def content_deps(store, course_id):
+    """Dependency keys for a course's content store entry and its fragment files"""
+    deps = {f"entry:{store}:{course_id}"}
+    entry = default_store().entry(store, course_id)
+    if entry is None:
+        # No detailed content: the page falls back to built-in defaults
+        deps.add(f"default:{store}")
+    else:
+        deps.update(f"content:{relpath}" for relpath in entry['sections'].values())
+    return deps
+
+
+def resolve_slug(item, ctx):
+    """Pick the course's output folder"""
+    item['folder'] = resolve_folder(item['record'])
+
+
+def render_index(item, ctx):
+    """Render index.html from the shared template, plus the course's shared demo module"""
+    record = item['record']
+    with build_trace.span('content'):
+        content = build_all_courses.get_course_content(record['id'], record['title'], record['level'])
+
+    with build_trace.span('render index.html'):
+        demo_js = build_all_courses.create_demo_js(record['id'], content['demo_type'])
+        chart_scripts = chart_script_tags(detect_chart_libraries(demo_js), ctx.vendored_charts)
+        demo_data = demo_js.encode('utf-8')
+        if ctx.minify_cache:
+            # Minified before hashing so the module's name matches the bytes served
+            demo_data = ctx.minify_cache.minify('js', demo_data)
+        demo_path = build_all_courses.demo_module_path(demo_data)
+        demo_script = f'\n    <script src="../{demo_path}"></script>'
+        template = load_template()
+        html = template.render(course_page_values(
+            record['id'], record['title'], record['level'],
+            record.get('duration', '2h'), content['theory'], demo_script, chart_scripts, ctx.urls
+        ))
+
+    item['deps'].update(content_deps('build', record['id']))
+    item['deps'].add(f"demo:{content['demo_type']}")
+    item['content'] = content
+    item['demo'] = demo_path
+    item['shared'][demo_path] = demo_data
+    item['files']['index.html'] = html
+    # The template digest stands in for the page shell in the input hash
+    item['inputs'] += [content['theory'], content['demo_type'], demo_path, chart_scripts, template.digest] + sorted(ctx.urls.values())
+
+
+def render_course_js(item, ctx):
+    """Render course.js: a small config pointing at the shared demo module"""
+    record = item['record']
+    with build_trace.span('render course.js'):
+        config = json.dumps({'id': record['id'], 'demo': item['content']['demo_type'], 'module': f"../{item['demo']}"})
+        js = build_all_courses.COURSE_CONFIG_JS.format(course_id=record['id'], title=record['title'], config=config)
+    item['files']['course.js'] = js.encode('utf-8')
+
+
+def render_app_js(item, ctx):
+    """Render app.js from the course's app definition"""
+    record = item['record']
+    with build_trace.span('render app.js'):
+        app_data = generate_course_apps.generate_course_app(
+            record['id'], record['title'], generate_course_apps.course_app_tags(record)
+        )
+        app_js = generate_course_apps.render_app_js(app_data).encode('utf-8')
+    item['deps'].update(content_deps('apps', record['id']))
+    item['files']['app.js'] = app_js
+    item['inputs'].append(app_js)
+
+
+def minify_outputs(item, ctx):
+    """Minify the course's HTML and JS files, recording bytes before and after"""
+    before = after = 0
+    with build_trace.span('minify'):
+        for filename, data in item['files'].items():
+            before += len(data)
+            kind = minify_module.kind_for(filename)
+            if kind:
+                item['files'][filename] = data = ctx.minify_cache.minify(kind, data)
+            after += len(data)
+    item['minified'] = {'before': before, 'after': after}
+    item['inputs'].append(f"minify {minify_module.MINIFY_VERSION}")
+
+
+def render_key(item, ctx):
+    """Render cache key: every input of the render stages, hashed before running them"""
+    record = item['record']
+    store = default_store()
+    parts = [ctx.generator, json.dumps(record, sort_keys=True), load_template().digest]
+    parts += sorted(ctx.urls.values())
+    parts.append(f"apps={ctx.apps} minify={bool(ctx.minify_cache)} vendored={ctx.vendored_charts}")
+    for store_name in ('build', 'apps') if ctx.apps else ('build',):
+        entry = store.entry(store_name, record['id'])
+        parts.append(json.dumps(entry, sort_keys=True))
+        for section in sorted((entry or {}).get('sections', {})):
+            parts.append(store.read_bytes(store_name, record['id'], section))
+    return hash_parts(parts)
+
+
+def fetch_rendered(item, ctx):
+    """Restore the course's rendered files from the render cache on a hit"""
+    with build_trace.span('render cache'):
+        item['cache_key'] = render_key(item, ctx)
+        cached = ctx.render_cache.get(item['cache_key'])
+    if cached is None:
+        item['cache'] = 'miss'
+        return
+    header, files, shared = cached
+    item.update(cache='hit', files=files, shared=shared, demo=header['demo'], input_hash=header['hash'])
+    item['deps'].update(header['deps'])
+    if 'minified' in header:
+        item['minified'] = header['minified']
+
+
+def store_rendered(item, ctx):
+    """Save a freshly rendered course to the render cache"""
+    item['input_hash'] = hash_parts(item['inputs'])
+    header = {'hash': item['input_hash'], 'demo': item['demo'], 'deps': sorted(item['deps'])}
+    if 'minified' in item:
+        header['minified'] = item['minified']
+    with build_trace.span('render cache'):
+        ctx.render_cache.put(item['cache_key'], header, item['files'], item['shared'])
+
+
+def linked_assets(urls):
+    """Output-relative paths of the shared assets that pages built with `urls` link to"""
+    return sorted(url.removeprefix('../') for url in urls.values())
+
+
+def is_up_to_date(previous, item, input_hash, output):
+    """Check whether a previous manifest entry still matches the inputs and files on disk"""
+    if not previous or previous.get('hash') != input_hash or previous.get('folder') != item['folder']:
+        return False
+    if set(previous.get('files', {})) != set(item['files']):
+        return False
+    demo = previous.get('demo')
+    if not demo or output.size(demo['path']) != demo['size']:
+        return False
+    return all(
+        output.size(f"{item['folder']}/{filename}") == info['size']
+        for filename, info in previous['files'].items()
+    )
+
+
+def write_outputs(item, ctx):
+    """Write the rendered files unless the manifest shows they are unchanged"""
+    input_hash = item.get('input_hash') or hash_parts(item['inputs'])
+    previous = item['previous']
+    deps = sorted(item['deps'])
+    assets = linked_assets(ctx.urls)
+    if is_up_to_date(previous, item, input_hash, ctx.output):
+        if previous.get('deps') == deps and previous.get('assets') == assets:
+            item['entry'] = previous
+        else:
+            item['entry'] = dict(previous, deps=deps, assets=assets)
+        return
+
+    with build_trace.span('write'):
+        for relpath, data in item['shared'].items():
+            ctx.output.write_shared(relpath, data)
+
+        entry = {
+            'folder': item['folder'],
+            'hash': input_hash,
+            'files': {},
+            'demo': {'path': item['demo'], 'size': len(item['shared'][item['demo']])},
+            # Inputs beyond the catalog record and shared templates, for --watch
+            'deps': deps,
+            # Fingerprinted copies the page links to, kept on disk while it does
+            'assets': assets,
+        }
+        if 'minified' in item:
+            entry['minified'] = item['minified']
+        for filename, data in item['files'].items():
+            ctx.output.write(f"{item['folder']}/{filename}", data)
+            entry['files'][filename] = {'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+
+    item['entry'] = entry
+    item['built'] = True
+
+
+# Stages a render cache hit replaces
+RENDER_STAGES = {render_index, render_course_js, render_app_js, minify_outputs, store_rendered}
+
+
+# ---- Driving records through the stages ----
+
+def build_record(record, previous, ctx):
+    """Stream one record through every stage, returning (entry, built, error, trace_events, stats)
+
+    Runs in pool workers, so errors and trace events come back to the parent as data,
+    along with stats: render seconds, the render cache outcome ('hit', 'miss' or None),
+    the files a site_archive.ArchiveOutput queued and, on failure, the exception and
+    traceback text.
+    """
+    if ctx.profile:
+        build_trace.start()
+    item = {
+        'record': record,
+        'previous': previous,
+        'folder': None,
+        'files': {},
+        'shared': {},
+        'inputs': [json.dumps(record, sort_keys=True)],
+        'deps': set(),
+        'entry': None,
+        'built': False,
+    }
+    stats = {}
+    start = time.perf_counter()
+    try:
+        with build_trace.span('course', id=record['id']):
+            for stage in ctx.stages:
+                if item.get('cache') == 'hit' and stage in RENDER_STAGES:
+                    continue
+                stage(item, ctx)
+        result = item['entry'], item['built'], None
+        # Files an archive output queued instead of writing, for the parent to pack
+        outputs = ctx.output.drain()
+        if outputs:
+            stats['outputs'] = outputs
+    except Exception as e:
+        ctx.output.drain()
+        result = None, False, str(e)
+        stats['exception'] = f"{type(e).__name__}: {e}"
+        stats['exception_type'] = type(e).__name__
+        stats['traceback'] = traceback.format_exc()
+    stats.update(seconds=time.perf_counter() - start, cache=item.get('cache'))
+    events = build_trace.drain() if ctx.profile else []
+    return result + (events, stats)
+
+
+def _build_record_task(task):
+    """Unpack a pool task tuple for build_record"""
+    return build_record(*task)
+
+
+def load_manifest(base_path=BASE_PATH):
+    """Load the build manifest, or an empty one if missing or unreadable"""
+    manifest_path = os.path.join(base_path, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'courses': {}}
+    manifest.setdefault('courses', {})
+    return manifest
+
+
+def save_manifest(manifest, base_path=BASE_PATH):
+    """Write the build manifest next to the generated courses"""
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    write_atomic(os.path.join(base_path, MANIFEST_NAME), data)
+
+
+def remove_course_files(entry, output):
+    """Delete the files a manifest entry recorded, their precompressed siblings, and the folder once empty"""
+    for filename in entry.get('files', {}):
+        output.remove(f"{entry['folder']}/{filename}")
+        for suffix in precompress.SUFFIXES.values():
+            output.remove(f"{entry['folder']}/{filename}{suffix}")
+    output.remove_dir(entry['folder'])
+
+
+def remove_unused_demos(entries, output):
+    """Delete shared demo modules no course references any more, and their siblings, returning how many"""
+    used = {entry['demo']['path'] for entry in entries if 'demo' in entry}
+    removed = 0
+    for name in output.list_dir(build_all_courses.DEMOS_DIR):
+        module = name
+        for suffix in precompress.SUFFIXES.values():
+            module = module.removesuffix(suffix)
+        if module.endswith('.js') and f"{build_all_courses.DEMOS_DIR}/{module}" not in used:
+            output.remove(f"{build_all_courses.DEMOS_DIR}/{name}")
+            if name == module:
+                removed += 1
+    return removed
+
+
+def report_demo_savings(entries):
+    """Print how many bytes shared demo modules save over per-course copies"""
+    entries = [entry for entry in entries if 'demo' in entry]
+    per_course = sum(entry['demo']['size'] for entry in entries)
+    modules = {entry['demo']['path']: entry['demo']['size'] for entry in entries}
+    configs = sum(entry['files']['course.js']['size'] for entry in entries)
+    saved = per_course - sum(modules.values()) - configs
+    print(f"♻️ {len(modules)} shared demo modules for {len(entries)} courses, "
+          f"{saved / 1024:.1f} KB saved vs per-course copies")
+
+
+def report_missing_vendored_charts(base_path):
+    """Warn about vendored chart libraries that pages will reference but are not on disk"""
+    for library in CHART_LIBRARIES.values():
+        if not os.path.exists(os.path.join(base_path, library['local'])):
+            print(f"⚠️ {library['local']} is missing; download it from {library['cdn']}")
+
+
+def report_minify_savings(entries):
+    """Print total course file bytes before and after minification"""
+    sizes = [entry['minified'] for entry in entries if 'minified' in entry]
+    before = sum(size['before'] for size in sizes)
+    after = sum(size['after'] for size in sizes)
+    if before:
+        print(f"📉 Minified {len(sizes)} courses: {before / 1024:.1f} KB -> {after / 1024:.1f} KB "
+              f"({100 - after * 100 / before:.0f}% smaller)")
+
+
+def run(records, ctx, jobs=1, previous_courses=None, report=None):
+    """Build records in catalog order, yielding (record, entry, built, error) per record
+
+    With jobs > 1 the records are spread over worker processes; executor.map yields
+    in submission order, so the output stays deterministic. Each result is also added
+    to `report`, a build_report.BuildReport, when given.
+    """
+    previous_courses = previous_courses or {}
+    tasks = [(record, previous_courses.get(str(record['id'])), ctx) for record in records]
+    if jobs > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(_build_record_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    else:
+        executor = None
+        results = map(_build_record_task, tasks)
+
+    try:
+        for record, (entry, built, error, events, stats) in zip(records, results):
+            build_trace.add_events(events)
+            if 'outputs' in stats:
+                with build_trace.span('archive'):
+                    ctx.output.commit(stats.pop('outputs'))
+            if ctx.render_cache:
+                ctx.render_cache.record(stats['cache'])
+            if report is not None:
+                report.add_course(record, entry, built, error, stats)
+            yield record, entry, built, error
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def apply_results(results, total, previous_courses, current_courses, output):
+    """Record build results in current_courses, printing a line per built or failed course
+
+    Returns (built, skipped, failed).
+    """
+    built = skipped = failed = 0
+    for i, (course, entry, was_built, error) in enumerate(results, 1):
+        key = str(course['id'])
+        if error is not None:
+            failed += 1
+            print(f"❌ [{i}/{total}] Error creating course {course['id']}: {error}")
+            # Keep the old entry so a transient failure does not delete the course's files
+            if key in previous_courses:
+                current_courses[key] = previous_courses[key]
+            continue
+
+        current_courses[key] = entry
+        old_entry = previous_courses.get(key)
+        if old_entry and old_entry['folder'] != entry['folder']:
+            remove_course_files(old_entry, output)
+        if was_built:
+            built += 1
+            sizes = entry.get('minified')
+            print(f"✅ [{i}/{total}] Course {course['id']}: {course['title']}" +
+                  (f" ({sizes['before']:,} -> {sizes['after']:,} bytes)" if sizes else ""))
+        else:
+            skipped += 1
+    return built, skipped, failed
+
+
+def remove_stale_courses(previous_courses, current_courses, output):
+    """Delete the files of courses that are no longer built, returning how many"""
+    removed = 0
+    for key, entry in previous_courses.items():
+        if key not in current_courses:
+            remove_course_files(entry, output)
+            removed += 1
+    return removed
+
+
+def publish_indexes(base_path, courses):
+    """Write the catalog-wide outputs: search index and catalog shards"""
+    with build_trace.span('search index'):
+        search_index.build_search_index(base_path, courses)
+    with build_trace.span('catalog shards'):
+        catalog_shards.write_catalog_shards(base_path, courses)
+
+
+def save_build(manifest, current_courses, ctx):
+    """Save the manifest for current_courses and drop demo modules and shared assets nothing uses"""
+    manifest['courses'] = current_courses
+    with build_trace.span('manifest'):
+        save_manifest(manifest, ctx.base_path)
+        remove_unused_demos(current_courses.values(), ctx.output)
+        # Entries from before assets were recorded may link to any copy; keep them all until rebuilt
+        entries = current_courses.values()
+        if all('assets' in entry for entry in entries):
+            used = {relpath for entry in entries for relpath in entry['assets']}
+            remove_unused_assets(ctx.base_path, used.union(linked_assets(ctx.urls)))
+
+
+def parse_args(argv=None, apps=True):
+    """Parse command line options"""
+    import sharding
+    parser = argparse.ArgumentParser(description="Generate all course folders from courses-data.js")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of worker processes (default: 1, 0 = one per CPU)")
+    parser.add_argument('--base-path', default=BASE_PATH,
+                        help="directory holding courses-data.js and the generated courses")
+    parser.add_argument('--profile', metavar='TRACE_JSON',
+                        help="record per-course, per-stage timings and tracemalloc peaks to a Chrome trace file")
+    if apps:
+        parser.add_argument('--no-apps', dest='apps', action='store_false',
+                            help="skip the app.js stage")
+    parser.add_argument('--vendor-charts', action='store_true',
+                        help="load chart libraries from shared/vendor/ instead of their CDNs")
+    parser.add_argument('--minify', action='store_true',
+                        help="collapse HTML whitespace and strip JS comments and whitespace (cached in .minify-cache)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after building, keep running and rebuild only the courses affected by each edit")
+    parser.add_argument('--precompress', action='store_true',
+                        help="write .gz/.br siblings of every servable file (see precompress.py)")
+    parser.add_argument('--shard', metavar='I/N', type=sharding.parse_shard,
+                        help="build only shard I of N, partitioned by course id hash (see sharding.py)")
+    parser.add_argument('--render-cache', metavar='DIR', default=os.environ.get('COURSE_RENDER_CACHE'),
+                        help="reuse rendered courses from a shared cache directory, e.g. on NFS "
+                             "(default: $COURSE_RENDER_CACHE; see render_cache.py)")
+    parser.add_argument('--render-cache-size', metavar='SIZE', type=render_cache_module.parse_size,
+                        help="evict least recently used cache entries beyond SIZE, e.g. 2G")
+    parser.add_argument('--report', metavar='JSON',
+                        help="write a JSON build report: per-course render time and bytes, cache use, failures")
+    parser.add_argument('--metrics', metavar='PROM',
+                        help="write the build report for the Prometheus textfile collector (see build_report.py)")
+    parser.add_argument('--reproducible', action='store_true',
+                        help="stamp generated files with the input commit time (see reproducible.py)")
+    parser.add_argument('--delta-bundle', metavar='BUNDLE',
+                        help="also write a .tar.gz of the files changed since the last export (see delta_bundle.py)")
+    parser.add_argument('--release-root', metavar='DIR',
+                        help="build into a staged generation under DIR and publish it by swapping DIR/current "
+                             "(see publish.py)")
+    parser.add_argument('--archive', metavar='ZIP',
+                        help="write the site into one uncompressed zip instead of course folders; "
+                             "serve it with site_archive.py")
+    parser.add_argument('--staging-dir', metavar='DIR',
+                        help="with --release-root or --archive, stage the build here instead, e.g. on tmpfs")
+    parser.set_defaults(apps=apps)
+    return parser.parse_args(argv)
+
+
+def main(argv=None, apps=True):
+    """Build every course in one pass over the catalog"""
+    args = parse_args(argv, apps)
+    base_path = args.base_path
+    if args.watch and (args.release_root or args.shard):
+        print("❌ --watch rebuilds in place and cannot be combined with --release-root or --shard")
+        sys.exit(2)
+    if args.archive and (args.watch or args.release_root or args.shard or args.delta_bundle):
+        print("❌ --archive packs a whole site and cannot be combined with --watch, --release-root, --shard "
+              "or --delta-bundle")
+        sys.exit(2)
+    if args.reproducible:
+        import reproducible
+        try:
+            epoch = reproducible.source_date_epoch(base_path)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(2)
+    jobs = args.jobs or os.cpu_count() or 1
+    report = build_report.BuildReport(jobs) if args.report or args.metrics else None
+    profile = bool(args.profile)
+    if profile:
+        build_trace.start()
+
+    print("🚀 Starting course generation...")
+    print("=" * 60)
+
+    with build_trace.span('parse catalog'):
+        courses = load_catalog(os.path.join(base_path, 'courses-data.js'))
+    records = courses
+    if args.shard:
+        import sharding
+        records = sharding.shard_records(courses, *args.shard)
+        print(f"🧩 Shard {args.shard[0]}/{args.shard[1]}: {len(records)} of {len(courses)} courses")
+
+    # Output goes to base_path itself, or to a staged generation published at the end
+    release = None
+    output_path = base_path
+    if args.release_root:
+        release = publish.ReleaseRoot(args.release_root)
+        with build_trace.span('stage'):
+            output_path = release.stage(args.staging_dir)
+            publish.copy_static_site(base_path, output_path)
+    # Archive builds render courses straight into the zip; only catalog-wide outputs touch a scratch dir
+    archive = scratch = None
+    if args.archive:
+        output_path = scratch = tempfile.mkdtemp(prefix='course-archive-', dir=args.staging_dir)
+        archive = site_archive.ArchiveWriter(args.archive, epoch if args.reproducible else None)
+    encodings = precompress.available_encodings() if args.precompress else []
+
+    try:
+        # Archive builds start from an empty scratch dir, so there are no folders to check
+        if not archive:
+            _, duplicates, _ = build_folder_index(output_path, courses)
+            report_folder_problems(duplicates)
+
+        if args.vendor_charts:
+            report_missing_vendored_charts(base_path)
+        with build_trace.span('shared assets'):
+            urls = asset_urls(publish_shared_assets(output_path))
+        render_cache = None
+        if args.render_cache:
+            render_cache = render_cache_module.RenderCache(args.render_cache, args.render_cache_size)
+        ctx = BuildContext(output_path, apps=args.apps, profile=profile, minify=args.minify,
+                           vendored_charts=args.vendor_charts, urls=urls, render_cache=render_cache)
+        if archive:
+            ctx.output = site_archive.ArchiveOutput(encodings, archive)
+            if ctx.minify_cache:
+                # The scratch dir is deleted after packing; keep the cache with the sources
+                ctx.minify_cache = minify_module.MinifyCache(os.path.join(base_path, minify_module.CACHE_DIR))
+        manifest = load_manifest(output_path)
+        previous_courses = manifest['courses']
+        current_courses = {}
+
+        results = run(records, ctx, jobs, previous_courses, report)
+        built, skipped, failed = apply_results(results, len(records), previous_courses, current_courses, ctx.output)
+        removed = remove_stale_courses(previous_courses, current_courses, ctx.output)
+        if args.shard:
+            manifest['shard'] = sharding.shard_info(args.shard, courses)
+        else:
+            manifest.pop('shard', None)
+        # Saved first, so a failure in the catalog-wide outputs does not cost the next build its manifest
+        save_build(manifest, current_courses, ctx)
+        # Catalog-wide outputs come from the first shard only, so shard trees merge cleanly
+        if not args.shard or args.shard[0] == 1:
+            publish_indexes(output_path, courses)
+
+        if args.precompress and not archive:
+            with build_trace.span('precompress'):
+                assets = precompress.collect_assets(output_path, current_courses.values())
+                precompressed = precompress.precompress_tree(output_path, assets, jobs)
+        elif not archive:
+            precompress.drop_stale(output_path)
+
+        if args.reproducible and not archive:
+            with build_trace.span('normalize mtimes'):
+                outputs = reproducible.output_files(output_path, current_courses.values(), static=bool(release))
+                reproducible.normalize_mtimes(output_path, outputs, epoch)
+
+        if render_cache:
+            with build_trace.span('cache eviction'):
+                evicted = render_cache.evict()
+
+        if args.delta_bundle:
+            with build_trace.span('delta bundle'):
+                delta = delta_bundle.export(output_path, args.delta_bundle, current_courses.values())
+
+        if release:
+            with build_trace.span('publish'):
+                previous_generation = release.generation(publish.CURRENT_LINK)
+                generation = release.publish(output_path)
+                output_path = release.path(generation)
+
+        if archive:
+            with build_trace.span('archive'):
+                archive.add_tree(output_path, site_archive.site_relpaths(output_path), encodings)
+                archive.add_tree(base_path, site_archive.static_relpaths(base_path), encodings)
+                archive.close()
+                output_path = args.archive
+    except BaseException:
+        # A failed or interrupted build never becomes a generation or an archive; drop what it staged
+        if release:
+            release.discard(output_path)
+        if archive:
+            archive.discard()
+        raise
+    finally:
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    print("=" * 60)
+    report_demo_savings(current_courses.values())
+    if args.minify:
+        report_minify_savings(current_courses.values())
+    if args.precompress and not archive:
+        precompress.report(*precompressed, precompress.load_manifest(output_path)['files'])
+    if render_cache:
+        render_cache.report(evicted)
+    if args.delta_bundle:
+        delta_bundle.report(delta, args.delta_bundle)
+    if archive:
+        print(f"🗜️ Packed {len(archive.names)} files ({archive.bytes / 1024 ** 2:.1f} MB) into {args.archive}")
+    print(f"🎉 Built {built}, skipped {skipped} unchanged, removed {removed} stale courses" +
+          (f", {failed} failed" if failed else ""))
+    if release:
+        print(f"🔀 Published generation {generation} at {os.path.join(release.root, publish.CURRENT_LINK)}" +
+              (f" (rollback: {previous_generation})" if previous_generation else ""))
+    print(f"📁 Location: {output_path}")
+
+    if report:
+        extra = {'shard': f"{args.shard[0]}/{args.shard[1]}"} if args.shard else {}
+        summary = report.finish(removed, render_cache, **extra)
+        if args.report:
+            build_report.write_json(args.report, summary)
+            print(f"📋 Build report written to {args.report}")
+        if args.metrics:
+            build_report.write_metrics(args.metrics, summary)
+            print(f"📈 Metrics written to {args.metrics}")
+
+    if profile:
+        events = build_trace.stop()
+        build_trace.write_trace(args.profile, events, {'courses': len(courses), 'jobs': jobs})
+        for name, (count, total_ms, peak_kb) in sorted(build_trace.summarize(events).items()):
+            print(f"⏱️ {name:<18} {count:>6}x {total_ms:>10.1f} ms  peak {peak_kb:>9.1f} KB")
+        print(f"🔥 Trace written to {args.profile}")
+
+    if args.watch:
+        import build_watch
+        build_watch.Watcher(ctx, args, manifest, jobs).run()
+
+
+if __name__ == '__main__':
+    main()
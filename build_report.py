@@ -0,0 +1,164 @@
+"""
+Machine-readable build reports
+build_pipeline.py --report FILE writes a JSON summary of the build, and --metrics FILE
+its aggregates in the Prometheus textfile-collector format, so monitoring can alert
+on regressions in build time or page weight:
+
+    {"version": 1, "started": 1792319993.2, "seconds": 4.81, "jobs": 4,
+     "totals": {"courses": 100, "built": 3, "skipped": 96, "failed": 1, "removed": 0,
+                "render_seconds": 3.92, "bytes": {"html": 1183744, "js": 402112},
+                "cache": {"hits": 0, "misses": 0}},
+     "courses": [{"id": 1, "folder": "course_001_intro_agents", "status": "built",
+                  "render_seconds": 0.031, "cache": null, "bytes": {"html": 11234, "js": 3310}}, ...],
+     "failures": [{"id": 7, "title": "...", "type": "KeyError", "error": "KeyError: 'theory'",
+                   "traceback": "..."}]}
+
+Totals count every course file plus each shared demo module once. Per-course detail
+stays in the JSON: the metrics carry no course ids or error text, only a render time
+histogram, totals and failure counts by exception class, so a 20k-course catalog
+exports a few dozen series. Both files are written by temp file and rename, as the
+textfile collector requires.
+"""
+
+import os
+import json
+import time
+
+from atomic_io import write_atomic
+
+REPORT_VERSION = 1
+# Upper bounds, in seconds, of the course render time histogram buckets
+RENDER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def file_type(name):
+    """'index.html' -> 'html'"""
+    return os.path.splitext(name)[1].lstrip('.') or 'other'
+
+
+class BuildReport:
+    """Collects per-course results in the parent process as the build runs"""
+
+    def __init__(self, jobs=1):
+        self.jobs = jobs
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.courses = []
+        self.failures = []
+        self.demos = {}
+
+    def add_course(self, record, entry, built, error, stats):
+        """Record one course's outcome; `stats` is build_record()'s per-course stats"""
+        course = {
+            'id': record['id'],
+            'folder': entry['folder'] if entry else None,
+            'status': 'failed' if error is not None else 'built' if built else 'skipped',
+            'render_seconds': round(stats['seconds'], 6),
+            'cache': stats.get('cache'),
+            'bytes': {},
+        }
+        if error is not None:
+            self.failures.append({
+                'id': record['id'],
+                'title': record.get('title'),
+                'type': stats.get('exception_type', 'Exception'),
+                'error': stats.get('exception', error),
+                'traceback': stats.get('traceback'),
+            })
+        else:
+            for name, info in entry['files'].items():
+                kind = file_type(name)
+                course['bytes'][kind] = course['bytes'].get(kind, 0) + info['size']
+            if 'demo' in entry:
+                self.demos[entry['demo']['path']] = entry['demo']['size']
+        self.courses.append(course)
+
+    def finish(self, removed=0, render_cache=None, **extra):
+        """The report as a dict; `extra` adds top-level fields such as the shard"""
+        totals = {
+            'courses': len(self.courses),
+            'built': sum(course['status'] == 'built' for course in self.courses),
+            'skipped': sum(course['status'] == 'skipped' for course in self.courses),
+            'failed': len(self.failures),
+            'removed': removed,
+            'render_seconds': round(sum(course['render_seconds'] for course in self.courses), 6),
+            'bytes': {},
+            'cache': {
+                'hits': render_cache.hits if render_cache else 0,
+                'misses': render_cache.misses if render_cache else 0,
+            },
+        }
+        for course in self.courses:
+            for kind, size in course['bytes'].items():
+                totals['bytes'][kind] = totals['bytes'].get(kind, 0) + size
+        for path, size in self.demos.items():
+            kind = file_type(path)
+            totals['bytes'][kind] = totals['bytes'].get(kind, 0) + size
+
+        report = {
+            'version': REPORT_VERSION,
+            'started': round(self.started, 3),
+            'seconds': round(time.perf_counter() - self._start, 6),
+            'jobs': self.jobs,
+        }
+        report.update(extra)
+        report.update(totals=totals, courses=self.courses, failures=self.failures)
+        return report
+
+
+def escape_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(report):
+    """The report in the Prometheus text exposition format"""
+    totals = report['totals']
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    metric('course_build_started_timestamp_seconds', 'gauge', "Unix time the build started.",
+           [({}, report['started'])])
+    metric('course_build_duration_seconds', 'gauge', "Wall-clock time of the whole build.",
+           [({}, report['seconds'])])
+    metric('course_build_courses', 'gauge', "Courses in the build by outcome.",
+           [({'status': status}, totals[status]) for status in ('built', 'skipped', 'failed', 'removed')])
+    metric('course_build_render_seconds', 'gauge', "Time spent rendering courses, summed over workers.",
+           [({}, totals['render_seconds'])])
+    metric('course_build_bytes', 'gauge', "Bytes of generated course files by file type.",
+           [({'type': kind}, size) for kind, size in sorted(totals['bytes'].items())])
+    metric('course_build_render_cache_lookups', 'gauge', "Render cache lookups by result.",
+           [({'result': 'hit'}, totals['cache']['hits']), ({'result': 'miss'}, totals['cache']['misses'])])
+    # A histogram rather than a series per course keeps cardinality independent of catalog size
+    name = 'course_render_duration_seconds'
+    seconds = [course['render_seconds'] for course in report['courses']]
+    lines.append(f"# HELP {name} Time to render one course.")
+    lines.append(f"# TYPE {name} histogram")
+    for bound in RENDER_BUCKETS:
+        lines.append(f'{name}_bucket{{le="{bound}"}} {sum(value <= bound for value in seconds)}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {len(seconds)}')
+    lines.append(f"{name}_sum {round(sum(seconds), 6)}")
+    lines.append(f"{name}_count {len(seconds)}")
+
+    failures = {}
+    for failure in report['failures']:
+        failures[failure['type']] = failures.get(failure['type'], 0) + 1
+    metric('course_build_failures', 'gauge', "Courses that failed to build, by exception class.",
+           [({'exception': kind}, count) for kind, count in sorted(failures.items())])
+    return '\n'.join(lines) + '\n'
+
+
+def write_json(path, report):
+    """Write the report as JSON"""
+    write_atomic(path, json.dumps(report, indent=2).encode('utf-8'))
+
+
+def write_metrics(path, report):
+    """Write the report for the Prometheus node_exporter textfile collector"""
+    write_atomic(path, prometheus_text(report).encode('utf-8'))
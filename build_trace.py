@@ -0,0 +1,140 @@
+"""
+Per-stage tracing for the course build pipeline
+Records nested timing spans, with the tracemalloc peak each span allocated above what
+was already live when it started, and writes them as
+Chrome trace events that chrome://tracing, Perfetto and speedscope can open.
+Tracing is off unless start() is called, in which case span() is a no-op
+"""
+
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class Tracer:
+    """Collects complete ("X") trace events for one process"""
+
+    def __init__(self, trace_memory=True):
+        self.events = []
+        self.pid = os.getpid()
+        self.trace_memory = trace_memory
+        # Traced memory when each open span started, and the peak seen in it so far, innermost last
+        self._baselines = []
+        self._peaks = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the enclosed block as a span named `name`"""
+        if self.trace_memory:
+            # Fold what happened before this span into the parent's peak, then measure ours alone
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._baselines.append(tracemalloc.get_traced_memory()[0])
+            self._peaks.append(0)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            if self.trace_memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+                # Only what the span allocated, not memory live before it or inherited by a forked worker
+                args['peak_alloc_kb'] = round(max(0, peak - self._baselines.pop()) / 1024, 1)
+            self.events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': start / 1000,
+                'dur': duration / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args,
+            })
+
+    def drain(self):
+        """Return and forget the events collected so far"""
+        events, self.events = self.events, []
+        return events
+
+
+_active = None
+
+
+def start(trace_memory=True):
+    """Enable tracing in this process"""
+    global _active
+    # A forked pool worker inherits the parent's tracer; start over with its own
+    if _active is None or _active.pid != os.getpid():
+        _active = Tracer(trace_memory)
+    return _active
+
+
+def stop():
+    """Disable tracing in this process and return the collected events"""
+    global _active
+    tracer, _active = _active, None
+    if tracer is None:
+        return []
+    if tracer.trace_memory:
+        tracemalloc.stop()
+    return tracer.events
+
+
+def is_enabled():
+    """Whether tracing is on in this process"""
+    return _active is not None
+
+
+def span(name, **args):
+    """Context manager timing a stage when tracing is on, otherwise a no-op"""
+    if _active is None:
+        return nullcontext()
+    return _active.span(name, **args)
+
+
+def drain():
+    """Hand over events collected so far, e.g. from a pool worker to the parent"""
+    return _active.drain() if _active is not None else []
+
+
+def add_events(events):
+    """Merge events collected in another process"""
+    if _active is not None:
+        _active.events.extend(events)
+
+
+def summarize(events):
+    """Aggregate events by name into {name: (count, total_ms, max_peak_kb)}"""
+    summary = {}
+    for event in events:
+        count, total, peak = summary.get(event['name'], (0, 0.0, 0.0))
+        summary[event['name']] = (
+            count + 1,
+            total + event['dur'] / 1000,
+            max(peak, event['args'].get('peak_alloc_kb', 0.0)),
+        )
+    return summary
+
+
+def write_trace(path, events, metadata=None):
+    """Write events as a Chrome trace JSON file"""
+    names = [
+        {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+         'args': {'name': 'build' if pid == os.getpid() else f'worker {pid}'}}
+        for pid in sorted({event['pid'] for event in events})
+    ]
+    trace = {
+        'traceEvents': names + sorted(events, key=lambda event: (event['pid'], event['ts'])),
+        'displayTimeUnit': 'ms',
+        'otherData': metadata or {},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace, f)
@@ -0,0 +1,235 @@
+"""
+Watch mode for the course build pipeline
+After a full build, build_pipeline.py --watch polls the build inputs and rebuilds only
+the courses an edit affects. Each manifest entry lists the inputs its course used
+beyond its catalog record ("deps": content entries and fragments, demo type), which
+gives the dependency graph:
+
+    courses-data.js               -> courses whose catalog record changed, was added or removed
+    content/index.json            -> courses whose content entry changed
+    content/<store>/NNN/*         -> courses listing that fragment
+    build_all_courses.py          -> courses whose demo body or default theory changed
+    generate_course_apps.py       -> every course with an app.js
+    shared/course-template.html,
+    shared course assets          -> every course
+
+Python sources are reloaded in place so their edits take effect without a restart.
+Polling uses os.stat only, so no extra dependencies are needed
+"""
+
+import os
+import time
+import importlib
+
+import build_trace
+import precompress
+import render_cache
+import build_pipeline
+import build_all_courses
+import content_store
+import generate_course_apps
+from course_catalog import load_catalog
+from course_template import TEMPLATE_PATH
+from shared_assets import SOURCE_DIR, SHARED_ASSETS, publish_shared_assets, asset_urls
+
+POLL_INTERVAL = 0.2
+
+
+def file_state(path):
+    """(mtime_ns, size) of a file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def content_fragments(root=content_store.CONTENT_DIR):
+    """Absolute paths of every fragment file under the content directory"""
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        paths.extend(os.path.join(dirpath, name) for name in filenames if name != content_store.INDEX_NAME)
+    return paths
+
+
+def display_path(path):
+    """A short name for a watched path: relative to the working directory when inside it"""
+    relpath = os.path.relpath(path)
+    return path if relpath.startswith('..') else relpath
+
+
+def demo_bodies(demo_types):
+    """Current demo JS for each demo type, after any fallback to the generic demo"""
+    return {demo_type: build_all_courses.create_demo_js(0, demo_type) for demo_type in demo_types}
+
+
+class Watcher:
+    """Polls build inputs and rebuilds the courses that depend on what changed"""
+
+    def __init__(self, ctx, args, manifest, jobs=1):
+        self.ctx = ctx
+        self.args = args
+        self.manifest = manifest
+        self.jobs = jobs
+        self.catalog_path = os.path.join(ctx.base_path, 'courses-data.js')
+        self.courses = {course['id']: course for course in load_catalog(self.catalog_path)}
+        self.content_index = content_store.default_store().index
+        self.demos = demo_bodies(self.demo_types())
+        self.default_theory = build_all_courses.DEFAULT_THEORY
+        self.states = self.snapshot()
+
+    def watched_paths(self):
+        """Every input file whose edits can change the output"""
+        paths = [
+            self.catalog_path,
+            os.path.join(content_store.CONTENT_DIR, content_store.INDEX_NAME),
+            build_all_courses.__file__,
+            TEMPLATE_PATH,
+        ]
+        if self.ctx.apps:
+            paths.append(generate_course_apps.__file__)
+        paths += [os.path.join(SOURCE_DIR, name) for name in SHARED_ASSETS.values()]
+        return paths + content_fragments()
+
+    def snapshot(self):
+        """Map each watched path to its current (mtime_ns, size)"""
+        return {path: file_state(path) for path in self.watched_paths()}
+
+    def demo_types(self):
+        """Demo types used by the courses in the manifest"""
+        return sorted({
+            dep.split(':', 1)[1]
+            for entry in self.manifest['courses'].values()
+            for dep in entry.get('deps', ())
+            if dep.startswith('demo:')
+        })
+
+    def dependents(self, deps):
+        """Ids of courses whose manifest entry lists any of `deps`"""
+        return {
+            int(key) for key, entry in self.manifest['courses'].items()
+            if deps.intersection(entry.get('deps', ()))
+        }
+
+    def affected(self, changed):
+        """Course ids to rebuild for a set of changed paths, plus ids to remove
+
+        Returns (rebuild, removed) where rebuild may be None meaning every course.
+        """
+        rebuild = set()
+        removed = set()
+        everything = False
+
+        if self.catalog_path in changed:
+            courses = {course['id']: course for course in load_catalog(self.catalog_path)}
+            removed = set(self.courses) - set(courses)
+            rebuild |= {course_id for course_id, course in courses.items() if self.courses.get(course_id) != course}
+            self.courses = courses
+
+        index_path = os.path.join(content_store.CONTENT_DIR, content_store.INDEX_NAME)
+        if index_path in changed:
+            content_store._default_store = None
+            index = content_store.default_store().index
+            changed_entries = {
+                f"entry:{store}:{course_id}"
+                for store in set(index) | set(self.content_index)
+                for course_id in set(index.get(store, {})) | set(self.content_index.get(store, {}))
+                if index.get(store, {}).get(course_id) != self.content_index.get(store, {}).get(course_id)
+            }
+            rebuild |= self.dependents(changed_entries)
+            self.content_index = index
+
+        fragments = {
+            f"content:{os.path.relpath(path, content_store.CONTENT_DIR).replace(os.sep, '/')}"
+            for path in changed if path.startswith(content_store.CONTENT_DIR + os.sep)
+        }
+        rebuild |= self.dependents(fragments)
+
+        if build_all_courses.__file__ in changed:
+            importlib.reload(build_all_courses)
+            demos = demo_bodies(self.demo_types())
+            deps = {f"demo:{demo_type}" for demo_type, body in demos.items() if self.demos.get(demo_type) != body}
+            if build_all_courses.DEFAULT_THEORY != self.default_theory:
+                deps.add('default:build')
+            self.demos = demos
+            self.default_theory = build_all_courses.DEFAULT_THEORY
+            # An edit elsewhere in the module could touch any course
+            everything |= not deps
+            rebuild |= self.dependents(deps)
+
+        if generate_course_apps.__file__ in changed:
+            importlib.reload(generate_course_apps)
+            everything = True
+
+        if TEMPLATE_PATH in changed:
+            everything = True
+
+        if self.ctx.render_cache and {build_all_courses.__file__, generate_course_apps.__file__} & changed:
+            # Reloaded generator code must not be served renders cached from the old code
+            self.ctx.generator = render_cache.generator_version()
+
+        asset_sources = {os.path.join(SOURCE_DIR, name) for name in SHARED_ASSETS.values()}
+        if asset_sources & changed:
+            self.ctx.urls = asset_urls(publish_shared_assets(self.ctx.base_path))
+            everything = True
+
+        return (None if everything else rebuild - removed), removed
+
+    def rebuild(self, ids, removed):
+        """Rebuild the given courses (None = all) and refresh the catalog-wide outputs"""
+        previous_courses = self.manifest['courses']
+        current_courses = dict(previous_courses)
+        for course_id in removed:
+            current_courses.pop(str(course_id), None)
+        build_pipeline.remove_stale_courses(previous_courses, current_courses, self.ctx.output)
+
+        records = list(self.courses.values()) if ids is None else [self.courses[i] for i in sorted(ids) if i in self.courses]
+        results = build_pipeline.run(records, self.ctx, self.jobs if ids is None else 1, previous_courses)
+        built, _, failed = build_pipeline.apply_results(
+            results, len(records), previous_courses, current_courses, self.ctx.output
+        )
+
+        courses = list(self.courses.values())
+        build_pipeline.save_build(self.manifest, current_courses, self.ctx)
+        build_pipeline.publish_indexes(self.ctx.base_path, courses)
+        if self.args.precompress:
+            assets = precompress.collect_assets(self.ctx.base_path, current_courses.values())
+            precompress.precompress_tree(self.ctx.base_path, assets, self.jobs)
+        else:
+            precompress.drop_stale(self.ctx.base_path)
+        return built, failed
+
+    def poll(self):
+        """Rebuild for any changes since the last poll; returns the changed paths"""
+        states = self.snapshot()
+        changed = {path for path in states.keys() | self.states.keys() if states.get(path) != self.states.get(path)}
+        self.states = states
+        if not changed:
+            return changed
+
+        start = time.perf_counter()
+        try:
+            ids, removed = self.affected(changed)
+            built, failed = self.rebuild(ids, removed)
+        except Exception as e:
+            # Half-edited sources often fail to parse; wait for the next save
+            print(f"❌ Rebuild failed: {e}")
+            return changed
+        elapsed = (time.perf_counter() - start) * 1000
+        names = ', '.join(sorted(display_path(path) for path in changed))
+        scope = 'all courses' if ids is None else f"{len(ids)} affected courses"
+        print(f"🔁 {names}: {scope}, built {built}" +
+              (f", removed {len(removed)}" if removed else "") +
+              (f", {failed} failed" if failed else "") + f" in {elapsed:.0f} ms")
+        return changed
+
+    def run(self):
+        """Poll until interrupted"""
+        build_trace.stop()
+        print(f"👀 Watching {len(self.states)} files for changes (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(POLL_INTERVAL)
+                self.poll()
+        except KeyboardInterrupt:
+            print("👋 Stopped watching")
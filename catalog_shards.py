@@ -0,0 +1,102 @@
+"""
+Per-level catalog shards for the course index page
+courses-data.js is split into catalog/<level>.json, one array of course cards per
+level in catalog order, plus catalog/summary.json with the counts the page needs for
+its stats and for sizing the virtually scrolled grid before any shard is fetched:
+
+    {"version": 1, "total": 100, "hours": 350.5,
+     "levels": [{"level": "beginner", "count": 20, "hours": 46.0, "shard": "catalog/beginner.json"}, ...]}
+
+Usage: python catalog_shards.py [directory]
+"""
+
+import os
+import re
+import sys
+import json
+
+from atomic_io import write_if_changed
+from course_catalog import load_catalog
+from course_folders import resolve_folder
+
+SHARD_DIR = "catalog"
+SUMMARY_NAME = "summary.json"
+SHARDS_VERSION = 1
+
+# Fields a course card on the index page uses
+CARD_FIELDS = ('id', 'title', 'description', 'level', 'tags', 'duration')
+HOURS_RE = re.compile(r'([\d.]+)\s*h')
+
+
+def duration_hours(duration):
+    """Hours in a duration such as '2.5h', or 0 if it cannot be read"""
+    match = HOURS_RE.match(duration or '')
+    return float(match.group(1)) if match else 0.0
+
+
+def course_card(record):
+    """The slice of a catalog record the index page renders"""
+    card = {field: record[field] for field in CARD_FIELDS if field in record}
+    card['folder'] = resolve_folder(record)
+    return card
+
+
+def build_shards(courses):
+    """Group catalog records into ({level: [card, ...]}, summary), levels in catalog order
+
+    Records without a level belong to no shard and are left out.
+    """
+    shards = {}
+    for record in courses:
+        if record.get('level'):
+            shards.setdefault(record['level'], []).append(course_card(record))
+
+    levels = [
+        {
+            'level': level,
+            'count': len(cards),
+            'hours': round(sum(duration_hours(card.get('duration')) for card in cards), 2),
+            'shard': f"{SHARD_DIR}/{level}.json",
+        }
+        for level, cards in shards.items()
+    ]
+    summary = {
+        'version': SHARDS_VERSION,
+        'total': sum(len(cards) for cards in shards.values()),
+        'hours': round(sum(level['hours'] for level in levels), 2),
+        'levels': levels,
+    }
+    return shards, summary
+
+
+def write_catalog_shards(base_path, courses):
+    """Write catalog/<level>.json and catalog/summary.json, deleting shards of vanished levels
+
+    Returns the summary.
+    """
+    shards, summary = build_shards(courses)
+    for record in courses:
+        if not record.get('level'):
+            print(f"⚠️ Course {record.get('id')} has no level; left out of the catalog shards")
+    shard_path = os.path.join(base_path, SHARD_DIR)
+    os.makedirs(shard_path, exist_ok=True)
+
+    for level, cards in shards.items():
+        data = json.dumps(cards, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        write_if_changed(os.path.join(shard_path, f"{level}.json"), data)
+    data = json.dumps(summary, separators=(',', ':')).encode('utf-8')
+    write_if_changed(os.path.join(shard_path, SUMMARY_NAME), data)
+
+    current = {f"{level}.json" for level in shards} | {SUMMARY_NAME}
+    for name in os.listdir(shard_path):
+        if name.endswith('.json') and name not in current:
+            os.remove(os.path.join(shard_path, name))
+    return summary
+
+
+if __name__ == '__main__':
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    summary = write_catalog_shards(root, load_catalog(os.path.join(root, 'courses-data.js')))
+    for level in summary['levels']:
+        print(f"📦 {level['shard']}: {level['count']} courses, {level['hours']}h")
+    print(f"📊 {summary['total']} courses, {summary['hours']}h total")
@@ -0,0 +1,38 @@
+
+function generatePrompt() {
+    const technique = document.getElementById('technique').value;
+    const task = document.getElementById('taskInput').value;
+    
+    const prompts = {
+        'zero-shot': `Task: ${task}\n\nAnswer:`,
+        'few-shot': `Example 1: "Great service!" -> Positive\nExample 2: "Terrible experience" -> Negative\nExample 3: "It's okay" -> Neutral\n\nTask: ${task}\n\nAnswer:`,
+        'chain-of-thought': `Task: ${task}\n\nLet's think step by step:\n1. First, identify key words\n2. Analyze emotional tone\n3. Determine overall sentiment\n\nAnswer:`,
+        'self-consistency': `Task: ${task}\n\nLet's solve this in multiple ways and find the most consistent answer.\n\nApproach 1:\nApproach 2:\nApproach 3:\n\nFinal Answer:`
+    };
+    
+    const prompt = prompts[technique];
+    const quality = Math.random() * 0.3 + 0.7; // 0.7-1.0
+    
+    courseUtils.displayOutput({
+        'Technique': technique,
+        'Generated Prompt': prompt,
+        'Estimated Quality': quality.toFixed(2),
+        'Token Count': prompt.split(' ').length
+    });
+    
+    updatePromptMetrics(technique, quality);
+}
+
+const promptHistory = [];
+
+function updatePromptMetrics(technique, quality) {
+    promptHistory.push({ technique, quality });
+    
+    const techniques = [...new Set(promptHistory.map(p => p.technique))];
+    const avgByTechnique = techniques.map(t => {
+        const scores = promptHistory.filter(p => p.technique === t).map(p => p.quality);
+        return scores.reduce((a, b) => a + b, 0) / scores.length;
+    });
+    
+    courseUtils.createBarChart('promptChart', techniques, avgByTechnique, 'Avg Quality by Technique');
+}
@@ -0,0 +1,58 @@
+
+function executeChain() {
+    const input = document.getElementById('chainInput').value;
+    const steps = [
+        { id: 'step1', name: 'Tokenize', fn: tokenize },
+        { id: 'step2', name: 'Analyze', fn: analyze },
+        { id: 'step3', name: 'Transform', fn: transform },
+        { id: 'step4', name: 'Summarize', fn: summarize }
+    ];
+    
+    let result = input;
+    const outputs = [];
+    let totalTime = 0;
+    
+    steps.forEach(step => {
+        if (document.getElementById(step.id).checked) {
+            const startTime = Date.now();
+            result = step.fn(result);
+            const duration = Date.now() - startTime;
+            totalTime += duration;
+            outputs.push({ step: step.name, output: result, duration });
+        }
+    });
+    
+    courseUtils.displayOutput({
+        'Input': input,
+        'Final Output': result,
+        'Steps Executed': outputs.length,
+        'Total Time': totalTime + 'ms',
+        'Pipeline': outputs.map(o => o.step).join(' → ')
+    });
+    
+    updateChainMetrics(outputs);
+}
+
+function tokenize(text) {
+    return text.split(' ').join(' | ');
+}
+
+function analyze(text) {
+    const wordCount = text.split(' ').length;
+    return text + ` [Words: ${wordCount}]`;
+}
+
+function transform(text) {
+    return text.toUpperCase();
+}
+
+function summarize(text) {
+    return text.substring(0, 50) + '...';
+}
+
+function updateChainMetrics(outputs) {
+    const labels = outputs.map(o => o.step);
+    const data = outputs.map(o => o.duration);
+    
+    courseUtils.createBarChart('chainChart', labels, data, 'Step Duration (ms)');
+}
@@ -0,0 +1,79 @@
+"""
+On-disk content store for course theory HTML and app code
+content/index.json lists, per store ("build", "courses", "apps") and course id, the
+small fields of an entry plus the fragment files holding its large sections. The index
+is loaded once; fragments are read only when a course is rendered and never cached,
+so memory stays flat as content grows. Large fragments are decoded straight from a
+memory map, without first copying their bytes
+"""
+
+import os
+import json
+import mmap
+
+# $COURSE_CONTENT_DIR points every generator at another store, e.g. a synthetic one
+CONTENT_DIR = os.environ.get('COURSE_CONTENT_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content')
+INDEX_NAME = 'index.json'
+
+# Fragments at least this large are decoded from a memory map instead of read into bytes
+MMAP_THRESHOLD = 64 * 1024
+
+
+class ContentStore:
+    """Lazy reader over a content directory"""
+
+    def __init__(self, root=CONTENT_DIR):
+        self.root = root
+        self._index = None
+
+    @property
+    def index(self):
+        """The parsed index.json, loaded on first use"""
+        if self._index is None:
+            try:
+                with open(os.path.join(self.root, INDEX_NAME), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = {}
+        return self._index
+
+    def ids(self, store):
+        """Sorted course ids that have an entry in `store`"""
+        return sorted(int(course_id) for course_id in self.index.get(store, {}))
+
+    def entry(self, store, course_id):
+        """The index entry for a course (small fields plus 'sections'), or None"""
+        return self.index.get(store, {}).get(str(course_id))
+
+    def fragment_path(self, store, course_id, section):
+        """Absolute path of a section's fragment file"""
+        return os.path.join(self.root, self.entry(store, course_id)['sections'][section])
+
+    def read_bytes(self, store, course_id, section):
+        """Read one section fragment as bytes"""
+        with open(self.fragment_path(store, course_id, section), 'rb') as f:
+            return f.read()
+
+    def read_text(self, store, course_id, section):
+        """Read one section fragment as text, BOM dropped and newlines normalized to '\n'
+
+        Fragments checked out with CRLF line endings then render the same bytes.
+        """
+        with open(self.fragment_path(store, course_id, section), 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                text = f.read().decode('utf-8-sig')
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = str(mapped, 'utf-8-sig')
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+_default_store = None
+
+
+def default_store():
+    """The process-wide store over content/"""
+    global _default_store
+    if _default_store is None:
+        _default_store = ContentStore()
+    return _default_store
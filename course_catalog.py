@@ -0,0 +1,165 @@
+"""
+Course catalog loader shared by all course generators
+Parses the `courses` array literal in courses-data.js in a single tokenizer pass
+and caches the result in a sidecar file keyed by the source's mtime and size
+"""
+
+import os
+import re
+import json
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'courses-data.js')
+
+# Bump when the parser output changes so stale sidecar caches are ignored
+PARSER_VERSION = 1
+
+TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[\[\]{}:,=;])
+""", re.VERBOSE | re.DOTALL)
+
+STRING_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+ESCAPE_RE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+class CatalogSyntaxError(ValueError):
+    """Raised when courses-data.js does not contain a parseable courses array"""
+
+
+def tokenize(text):
+    """Yield (kind, value, offset) tokens, skipping whitespace and comments"""
+    pos = 0
+    end = len(text)
+    while pos < end:
+        match = TOKEN_RE.match(text, pos)
+        if match is None:
+            raise CatalogSyntaxError(f"Unexpected character {text[pos]!r} at offset {pos}")
+        kind = match.lastgroup
+        if kind not in ('space', 'comment'):
+            yield kind, match.group(), pos
+        pos = match.end()
+
+
+def _unescape(match):
+    """Decode one JS string escape sequence"""
+    seq = match.group(1)
+    if seq.startswith('u{'):
+        return chr(int(seq[2:-1], 16))
+    if seq[0] in 'ux' and len(seq) > 1:
+        return chr(int(seq[1:], 16))
+    return STRING_ESCAPES.get(seq, seq)
+
+
+def _parse_value(tokens, token):
+    """Parse one JS literal value starting at `token`"""
+    kind, value, offset = token
+    if kind == 'string':
+        return ESCAPE_RE.sub(_unescape, value[1:-1])
+    if kind == 'number':
+        number = float(value)
+        return int(number) if number.is_integer() and '.' not in value else number
+    if kind == 'name' and value in LITERALS:
+        return LITERALS[value]
+    if value == '[':
+        items = []
+        for token in tokens:
+            if token[1] == ']':
+                return items
+            items.append(_parse_value(tokens, token))
+            token = next(tokens)
+            if token[1] == ']':
+                return items
+            if token[1] != ',':
+                raise CatalogSyntaxError(f"Expected ',' or ']' at offset {token[2]}")
+        raise CatalogSyntaxError("Unterminated array")
+    if value == '{':
+        obj = {}
+        for token in tokens:
+            if token[1] == '}':
+                return obj
+            if token[0] == 'string':
+                key = _parse_value(tokens, token)
+            elif token[0] in ('name', 'number'):
+                key = token[1]
+            else:
+                raise CatalogSyntaxError(f"Expected property name at offset {token[2]}")
+            token = next(tokens)
+            if token[1] != ':':
+                raise CatalogSyntaxError(f"Expected ':' at offset {token[2]}")
+            obj[key] = _parse_value(tokens, next(tokens))
+            token = next(tokens)
+            if token[1] == '}':
+                return obj
+            if token[1] != ',':
+                raise CatalogSyntaxError(f"Expected ',' or '}}' at offset {token[2]}")
+        raise CatalogSyntaxError("Unterminated object")
+    raise CatalogSyntaxError(f"Unexpected token {value!r} at offset {offset}")
+
+
+def parse_catalog(text, name='courses'):
+    """Return the list assigned to `name` (e.g. `const courses = [...]`) in JS source"""
+    tokens = tokenize(text)
+    previous = None
+    try:
+        for token in tokens:
+            if token[1] == '=' and previous is not None and previous[0] == 'name' and previous[1] == name:
+                courses = _parse_value(tokens, next(tokens))
+                if not isinstance(courses, list):
+                    raise CatalogSyntaxError(f"`{name}` is not an array")
+                return courses
+            previous = token
+    except StopIteration:
+        raise CatalogSyntaxError("Unexpected end of file") from None
+    raise CatalogSyntaxError(f"No `{name} = [...]` assignment found")
+
+
+def cache_path_for(js_path):
+    """Return the sidecar cache path for a catalog file"""
+    folder, filename = os.path.split(js_path)
+    return os.path.join(folder, '.' + os.path.splitext(filename)[0] + '.cache.json')
+
+
+_memo = {}
+
+
+def load_catalog(js_path=CATALOG_PATH):
+    """Load every course record from courses-data.js, using the sidecar cache when fresh"""
+    js_path = os.path.abspath(js_path)
+    stat = os.stat(js_path)
+    key = [PARSER_VERSION, stat.st_mtime_ns, stat.st_size]
+
+    if js_path in _memo and _memo[js_path][0] == key:
+        return _memo[js_path][1]
+
+    cache_path = cache_path_for(js_path)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('key') == key:
+            _memo[js_path] = (key, cached['courses'])
+            return cached['courses']
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    with open(js_path, 'r', encoding='utf-8') as f:
+        courses = parse_catalog(f.read())
+
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'courses': courses}, f, ensure_ascii=False)
+    except OSError:
+        # A read-only checkout still works, it just re-parses every time
+        pass
+
+    _memo[js_path] = (key, courses)
+    return courses
+
+
+def catalog_by_id(js_path=CATALOG_PATH):
+    """Return the catalog as a {course_id: record} dict"""
+    return {course['id']: course for course in load_catalog(js_path)}
@@ -0,0 +1,83 @@
+"""
+One-pass index of course_NNN_* folders shared by all course generators
+Scans a directory once with os.scandir and maps course ids to folder names,
+reporting ids with several folders (duplicates) or none (missing)
+
+Usage: python course_folders.py [directory]
+"""
+
+import os
+import re
+import sys
+
+FOLDER_RE = re.compile(r'course_(\d{3,})_')
+
+
+def slugify(title):
+    """Folder slug for a title, capped at 40 characters"""
+    return title.lower().replace(' ', '_').replace('&', 'and').replace('-', '_')[:40]
+
+
+def resolve_folder(record):
+    """The single folder-naming rule: the catalog's `folder`, else course_NNN_<slug of title>"""
+    return record.get('folder') or f"course_{record['id']:03d}_{slugify(record['title'])}"
+
+
+def scan_course_folders(root):
+    """Map course id -> sorted list of course_NNN_* folder names directly under root"""
+    folders = {}
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return folders
+    with entries:
+        for entry in entries:
+            match = FOLDER_RE.match(entry.name)
+            if match and entry.is_dir():
+                folders.setdefault(int(match.group(1)), []).append(entry.name)
+    for names in folders.values():
+        names.sort()
+    return folders
+
+
+def build_folder_index(root, catalog=None):
+    """Build an id -> folder index for root
+
+    Returns (index, duplicates, missing). When a course id has several folders the
+    catalog's `folder` field wins, otherwise the first name in sort order. `missing`
+    lists catalog ids without any folder and is empty when no catalog is given.
+    """
+    folders = scan_course_folders(root)
+    records = {course['id']: course for course in catalog or []}
+
+    index = {}
+    duplicates = {}
+    for course_id, names in folders.items():
+        preferred = records.get(course_id, {}).get('folder')
+        index[course_id] = preferred if preferred in names else names[0]
+        if len(names) > 1:
+            duplicates[course_id] = names
+
+    missing = sorted(course_id for course_id in records if course_id not in index)
+    return index, duplicates, missing
+
+
+def report_folder_problems(duplicates, missing=()):
+    """Print warnings for duplicate and missing course folders"""
+    for course_id, names in sorted(duplicates.items()):
+        print(f"⚠️ Course {course_id} has {len(names)} folders: {', '.join(names)}")
+    if missing:
+        print(f"⚠️ {len(missing)} courses have no folder: {', '.join(str(i) for i in missing)}")
+
+
+if __name__ == '__main__':
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    index, duplicates, missing = build_folder_index(root)
+    print(f"📁 {len(index)} course ids in {root}")
+    report_folder_problems(duplicates, missing)
+    # Gaps in the id sequence are worth a look too
+    if index:
+        gaps = [i for i in range(min(index), max(index) + 1) if i not in index]
+        if gaps:
+            print(f"⚠️ No folder for ids: {', '.join(str(i) for i in gaps)}")
+    sys.exit(1 if duplicates else 0)
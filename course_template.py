@@ -0,0 +1,151 @@
+"""
+Precompiled page templates for the course generators
+A template such as shared/course-template.html is compiled once into pre-encoded
+static byte segments and {{SLOT}} names, so rendering a course is a single join.
+Compiled templates are cached in a pickle keyed by the template's path, mtime and size,
+kept in the project root with the other dot-caches rather than in the served shared/
+"""
+
+import os
+import re
+import pickle
+import hashlib
+
+from shared_assets import asset_urls
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(BASE_PATH, 'shared', 'course-template.html')
+
+# Bump when the compiled format changes so stale sidecar caches are ignored
+ENGINE_VERSION = 1
+
+SLOT_RE = re.compile(r'\{\{\s*([A-Z][A-Z0-9_]*)\s*\}\}')
+
+# Chart libraries a course page may load, in load order. `pattern` finds uses in demo
+# code (courseUtils.createLineChart/createBarChart wrap Chart.js); `local` is the
+# vendored copy's path relative to the output root
+CHART_LIBRARIES = {
+    'plotly': {
+        'cdn': 'https://cdn.plot.ly/plotly-2.27.0.min.js',
+        'local': 'shared/vendor/plotly-2.27.0.min.js',
+        'pattern': re.compile(r'\bPlotly\.|\bcreatePlotlyChart\b'),
+    },
+    'chartjs': {
+        'cdn': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js',
+        'local': 'shared/vendor/chart-4.4.0.umd.min.js',
+        'pattern': re.compile(r'\bnew Chart\b|\bChart\.|\bcreate(?:Line|Bar)Chart\b'),
+    },
+}
+
+
+class CompiledTemplate:
+    """Static byte segments interleaved with slot names: seg0 slot0 seg1 slot1 ... segN"""
+
+    def __init__(self, segments, slots, digest):
+        self.segments = segments
+        self.slots = slots
+        self.digest = digest
+
+    def render(self, values):
+        """Fill every slot from `values` (str or bytes) and return the page as bytes"""
+        parts = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            try:
+                value = values[slot]
+            except KeyError:
+                raise KeyError(f"Template slot {{{{{slot}}}}} has no value") from None
+            parts.append(value if isinstance(value, bytes) else str(value).encode('utf-8'))
+            parts.append(segment)
+        return b''.join(parts)
+
+
+def compile_template(source):
+    """Compile template text into a CompiledTemplate"""
+    pieces = SLOT_RE.split(source)
+    # re.split alternates text, slot, text, ... starting and ending with text
+    segments = [piece.encode('utf-8') for piece in pieces[0::2]]
+    slots = pieces[1::2]
+    return CompiledTemplate(segments, slots, hashlib.sha256(source.encode('utf-8')).hexdigest())
+
+
+def cache_path_for(template_path):
+    """Return the cache path for a template file, outside the served tree"""
+    filename = os.path.basename(template_path)
+    return os.path.join(BASE_PATH, '.' + os.path.splitext(filename)[0] + '.cache.pickle')
+
+
+_memo = {}
+
+
+def load_template(template_path=TEMPLATE_PATH):
+    """Load a compiled template, recompiling only when the template file changed"""
+    template_path = os.path.abspath(template_path)
+    stat = os.stat(template_path)
+    # The path is part of the key, since templates with the same name share a cache file
+    key = (ENGINE_VERSION, template_path, stat.st_mtime_ns, stat.st_size)
+
+    if template_path in _memo and _memo[template_path][0] == key:
+        return _memo[template_path][1]
+
+    cache_path = cache_path_for(template_path)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, segments, slots, digest = pickle.load(f)
+        if cached_key == key:
+            template = CompiledTemplate(segments, slots, digest)
+            _memo[template_path] = (key, template)
+            return template
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+        pass
+
+    with open(template_path, 'r', encoding='utf-8-sig') as f:
+        template = compile_template(f.read())
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((key, template.segments, template.slots, template.digest), f)
+    except OSError:
+        pass
+
+    _memo[template_path] = (key, template)
+    return template
+
+
+def detect_chart_libraries(*sources):
+    """Names of the chart libraries the given JS sources use, in load order"""
+    return [
+        name for name, library in CHART_LIBRARIES.items()
+        if any(library['pattern'].search(source) for source in sources)
+    ]
+
+
+def chart_script_tags(libraries, vendored=False):
+    """Deferred <script> tags loading `libraries`, from the CDN or the vendored copies"""
+    tags = []
+    for name in libraries:
+        library = CHART_LIBRARIES[name]
+        src = f"../{library['local']}" if vendored else library['cdn']
+        tags.append(f'\n    <script src="{src}" defer></script>')
+    return ''.join(tags)
+
+
+def course_page_values(course_id, title, level, duration, content, demo_script='', chart_scripts='', urls=None):
+    """Slot values for shared/course-template.html
+
+    `demo_script` is extra markup placed right after the course.js script tag;
+    `chart_scripts` goes in <head>, see chart_script_tags(). `urls` maps shared asset
+    paths to the URLs pages use, see shared_assets.asset_urls().
+    """
+    urls = urls or asset_urls()
+    return {
+        'STYLES_HREF': urls['shared/course-styles.css'],
+        'UTILS_SRC': urls['shared/course-utils.js'],
+        'CHART_SCRIPTS': chart_scripts,
+        'COURSE_ID': course_id,
+        'COURSE_TITLE': title,
+        'LEVEL': level,
+        'LEVEL_LABEL': level.upper(),
+        'DURATION': duration,
+        'CONTENT': content,
+        'DEMO_SCRIPT': demo_script,
+    }
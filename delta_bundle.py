@@ -0,0 +1,239 @@
+"""
+Delta bundles for shipping a build to edge nodes
+Each export records the served files of an output tree, with sizes and hashes, in
+.site-manifest.json:
+
+    {"version": 1, "files": {"course_001_intro_agents/index.html":
+                                 {"size": 11234, "sha256": "...", "mtime_ns": ...}, ...}}
+
+and compares it with the manifest the previous export left there. The delta bundle
+is a gzipped tar holding only the added and changed files plus delta.json:
+
+    {"version": 1, "base": "<digest of the previous manifest>", "target": "<digest of the new one>",
+     "files": {"course_007_rag_basics/index.html": {"size": 5120, "sha256": "..."}, ...},
+     "deleted": ["course_099_old/index.html", ...]}
+
+so a one-course fix ships that course's files, not the site. `apply` updates a deployed
+tree in place: it checks the tree is at `base`, writes each file by temp file and
+rename, deletes the listed paths and stores the new manifest. Files whose size and
+mtime match the previous manifest reuse its hash instead of being read again.
+
+Usage: python delta_bundle.py export TREE BUNDLE
+       python delta_bundle.py apply BUNDLE TREE [--force]
+"""
+
+import io
+import os
+import sys
+import gzip
+import json
+import tarfile
+import hashlib
+import argparse
+
+import publish
+import precompress
+import site_archive
+import catalog_shards
+import build_all_courses
+from atomic_io import temp_path, write_atomic
+from shared_assets import ASSETS_DIR
+
+MANIFEST_NAME = ".site-manifest.json"
+DELTA_NAME = "delta.json"
+BUNDLE_VERSION = 1
+# Generated or vendored directories served as a whole
+SERVED_DIRS = [ASSETS_DIR, build_all_courses.DEMOS_DIR, catalog_shards.SHARD_DIR] + publish.STATIC_DIRS
+
+
+def site_files(base_path, course_entries=()):
+    """Sorted relative paths of every file the site serves
+
+    Servable files as precompress.py collects them, plus every file in SERVED_DIRS
+    (dotfiles aside), the precompression manifest and every .gz/.br sibling. Build
+    sources and caches are never shipped.
+    """
+    paths = set(precompress.collect_assets(base_path, course_entries))
+    for directory in SERVED_DIRS:
+        paths.update(f"{directory}/{relpath}"
+                     for relpath in site_archive.site_relpaths(os.path.join(base_path, *directory.split('/'))))
+    paths.add(precompress.MANIFEST_NAME)
+    paths.update(f"{path}{suffix}" for path in list(paths) for suffix in precompress.SUFFIXES.values())
+    return sorted(path for path in paths if os.path.isfile(os.path.join(base_path, *path.split('/'))))
+
+
+def file_manifest(base_path, relpaths, previous=None):
+    """{relpath: {size, sha256, mtime_ns}}, reusing hashes from `previous` for unchanged stats"""
+    previous = previous or {}
+    files = {}
+    for relpath in relpaths:
+        path = os.path.join(base_path, *relpath.split('/'))
+        stat = os.stat(path)
+        known = previous.get(relpath)
+        if known and known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns:
+            digest = known['sha256']
+        else:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        files[relpath] = {'size': stat.st_size, 'sha256': digest, 'mtime_ns': stat.st_mtime_ns}
+    return files
+
+
+def manifest_digest(files):
+    """Digest of a file manifest's paths, sizes and hashes; mtimes do not count"""
+    canonical = {path: [info['size'], info['sha256']] for path, info in files.items()}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def load_manifest(base_path):
+    """The file manifest an earlier export or apply left in base_path, or {}"""
+    try:
+        with open(os.path.join(base_path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(base_path, files):
+    """Store a file manifest in base_path"""
+    data = json.dumps({'version': BUNDLE_VERSION, 'files': files}, indent=2, sort_keys=True).encode('utf-8')
+    write_atomic(os.path.join(base_path, MANIFEST_NAME), data)
+
+
+def diff_manifests(previous, current):
+    """(changed, deleted): paths added or changed, and paths gone, both sorted"""
+    changed = sorted(
+        path for path, info in current.items()
+        if path not in previous or previous[path]['sha256'] != info['sha256']
+    )
+    deleted = sorted(set(previous) - set(current))
+    return changed, deleted
+
+
+def add_bytes(archive, name, data, mtime=0):
+    """Add an in-memory file to a tar archive"""
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    member.mtime = mtime
+    archive.addfile(member, io.BytesIO(data))
+
+
+def export(base_path, bundle_path, course_entries=()):
+    """Write a delta bundle of base_path against its previous manifest and update the manifest
+
+    Returns the delta.json dict.
+    """
+    previous = load_manifest(base_path)
+    current = file_manifest(base_path, site_files(base_path, course_entries), previous)
+    changed, deleted = diff_manifests(previous, current)
+    delta = {
+        'version': BUNDLE_VERSION,
+        'base': manifest_digest(previous),
+        'target': manifest_digest(current),
+        'files': {path: {'size': current[path]['size'], 'sha256': current[path]['sha256']} for path in changed},
+        'deleted': deleted,
+    }
+
+    tmp_path = temp_path(bundle_path)
+    # mtime 0 in the gzip header keeps bundles of identical deltas identical
+    with open(tmp_path, 'wb') as raw, \
+            gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as compressed, \
+            tarfile.open(fileobj=compressed, mode='w') as archive:
+        add_bytes(archive, DELTA_NAME, json.dumps(delta, indent=2, sort_keys=True).encode('utf-8'))
+        for relpath in changed:
+            path = os.path.join(base_path, *relpath.split('/'))
+            archive.add(path, arcname=f"files/{relpath}", recursive=False)
+    os.replace(tmp_path, bundle_path)
+    save_manifest(base_path, current)
+    return delta
+
+
+def safe_relpath(relpath):
+    """Reject bundle paths that would escape the target tree"""
+    parts = relpath.split('/')
+    if relpath.startswith('/') or '..' in parts or '' in parts:
+        raise ValueError(f"Unsafe path in bundle: {relpath!r}")
+    return relpath
+
+
+def apply(bundle_path, base_path, force=False):
+    """Update base_path in place from a delta bundle, returning the delta.json dict
+
+    Raises ValueError if the tree is not at the bundle's base (unless `force`) or a
+    file in the bundle does not match its recorded hash.
+    """
+    previous = load_manifest(base_path)
+    with tarfile.open(bundle_path, 'r:gz') as archive:
+        delta = json.load(archive.extractfile(DELTA_NAME))
+        if not force and manifest_digest(previous) != delta['base']:
+            raise ValueError(f"{base_path} is not at the build this bundle was made against; "
+                             "apply the missing bundles first or use --force")
+
+        files = dict(previous)
+        for relpath, info in sorted(delta['files'].items()):
+            member = archive.getmember(f"files/{safe_relpath(relpath)}")
+            data = archive.extractfile(member).read()
+            if hashlib.sha256(data).hexdigest() != info['sha256']:
+                raise ValueError(f"{relpath} in {bundle_path} does not match its recorded hash")
+            path = os.path.join(base_path, *relpath.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, data)
+            os.utime(path, (member.mtime, member.mtime))
+            files[relpath] = {'size': info['size'], 'sha256': info['sha256'], 'mtime_ns': os.stat(path).st_mtime_ns}
+
+    # Deletions last, so pages never reference files that are already gone
+    for relpath in delta['deleted']:
+        path = os.path.join(base_path, *safe_relpath(relpath).split('/'))
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        files.pop(relpath, None)
+        # Prune directories left empty, but never base_path itself or anything above it
+        root = os.path.abspath(base_path)
+        directory = os.path.dirname(os.path.abspath(path))
+        while directory.startswith(root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+    save_manifest(base_path, files)
+    return delta
+
+
+def report(delta, bundle_path):
+    """Print a one-line summary of a bundle"""
+    size = sum(info['size'] for info in delta['files'].values())
+    print(f"📦 {bundle_path}: {len(delta['files'])} added or changed ({size / 1024:.1f} KB), "
+          f"{len(delta['deleted'])} deleted, bundle {os.path.getsize(bundle_path) / 1024:.1f} KB")
+
+
+def main(argv=None):
+    """Export or apply a delta bundle"""
+    parser = argparse.ArgumentParser(description="Ship only what changed between two builds")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help="bundle the changes since the last export")
+    export_parser.add_argument('tree', help="built output tree")
+    export_parser.add_argument('bundle', help="bundle file to write (.tar.gz)")
+    apply_parser = commands.add_parser('apply', help="update a deployed tree from a bundle")
+    apply_parser.add_argument('bundle')
+    apply_parser.add_argument('tree', help="deployed tree to update in place")
+    apply_parser.add_argument('--force', action='store_true',
+                              help="apply even if the tree is not at the bundle's base build")
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        import build_pipeline
+        delta = export(args.tree, args.bundle, build_pipeline.load_manifest(args.tree)['courses'].values())
+    else:
+        try:
+            delta = apply(args.bundle, args.tree, args.force)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    report(delta, args.bundle)
+
+
+if __name__ == '__main__':
+    main()
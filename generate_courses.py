@@ -6,185 +6,40 @@ Each course includes: HTML, CSS, JS with interactive demos, visualizations, and
 import os
 import json
 
-# Course definitions with detailed content
-COURSES = [
-    # BEGINNER (1-20)
-    {
-        "id": 1,
-        "title": "Introduction to AI Agents",
-        "level": "beginner",
+from course_catalog import catalog_by_id
+from course_folders import build_folder_index, report_folder_problems, resolve_folder
+from course_template import load_template, course_page_values, detect_chart_libraries, chart_script_tags
+from content_store import default_store
+from shared_assets import publish_shared_assets, asset_urls
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+def load_course(course_id, store=None):
+    """Load a detailed course definition, reading its theory from content/courses/"""
+    store = store or default_store()
+    entry = store.entry('courses', course_id)
+    return {
+        "id": course_id,
+        "title": entry['title'],
+        "level": entry['level'],
         "content": {
-            "theory": """
-                <h2>What is an AI Agent?</h2>
-                <p>An AI agent is an autonomous entity that perceives its environment through sensors and acts upon it through actuators to achieve specific goals.</p>
-                
-                <h3>Key Components</h3>
-                <ul>
-                    <li><strong>Perception:</strong> Ability to sense and understand the environment</li>
-                    <li><strong>Reasoning:</strong> Processing information to make decisions</li>
-                    <li><strong>Action:</strong> Executing decisions in the environment</li>
-                    <li><strong>Learning:</strong> Improving performance over time</li>
-                </ul>
-                
-                <h3>Agent Architecture</h3>
-                <div class="info-box">
-                    <strong>Simple Reflex Agent:</strong> Acts based on current perception only<br>
-                    <strong>Model-Based Agent:</strong> Maintains internal state of the world<br>
-                    <strong>Goal-Based Agent:</strong> Acts to achieve specific goals<br>
-                    <strong>Utility-Based Agent:</strong> Maximizes expected utility
-                </div>
-                
-                <h2>Types of AI Agents</h2>
-                <h3>1. Reactive Agents</h3>
-                <p>Respond directly to environmental stimuli without internal state.</p>
-                
-                <h3>2. Deliberative Agents</h3>
-                <p>Maintain internal models and plan actions to achieve goals.</p>
-                
-                <h3>3. Hybrid Agents</h3>
-                <p>Combine reactive and deliberative capabilities for optimal performance.</p>
-                
-                <h2>Agent Properties</h2>
-                <ul>
-                    <li><strong>Autonomy:</strong> Operates without direct human intervention</li>
-                    <li><strong>Reactivity:</strong> Responds to environmental changes</li>
-                    <li><strong>Proactivity:</strong> Takes initiative to achieve goals</li>
-                    <li><strong>Social Ability:</strong> Interacts with other agents</li>
-                </ul>
-            """,
-            "demo": {
-                "type": "simple_agent",
-                "description": "Build a simple reactive agent that responds to inputs"
-            }
+            "theory": store.read_text('courses', course_id, 'theory'),
+            "demo": entry['demo']
         }
-    },
-    {
-        "id": 2,
-        "title": "Prompt Engineering Fundamentals",
-        "level": "beginner",
-        "content": {
-            "theory": """
-                <h2>What is Prompt Engineering?</h2>
-                <p>Prompt engineering is the art and science of crafting effective instructions for Large Language Models (LLMs) to generate desired outputs.</p>
-                
-                <h2>Core Principles</h2>
-                <h3>1. Clarity and Specificity</h3>
-                <p>Be explicit about what you want. Vague prompts lead to unpredictable results.</p>
-                <div class="code-block">
-Bad: "Write about dogs"
-Good: "Write a 200-word informative paragraph about Golden Retrievers, focusing on their temperament and suitability as family pets."
-                </div>
-                
-                <h3>2. Context Provision</h3>
-                <p>Provide relevant background information to guide the model.</p>
-                
-                <h3>3. Format Specification</h3>
-                <p>Clearly define the desired output format (JSON, bullet points, essay, etc.)</p>
-                
-                <h2>Advanced Techniques</h2>
-                <h3>Few-Shot Learning</h3>
-                <p>Provide examples of input-output pairs to guide the model's behavior.</p>
-                <div class="code-block">
-Example 1:
-Input: "The movie was fantastic!"
-Output: Positive
-
-Example 2:
-Input: "I hated every minute of it."
-Output: Negative
-
-Now classify: "It was okay, nothing special."
-                </div>
-                
-                <h3>Chain-of-Thought (CoT)</h3>
-                <p>Encourage step-by-step reasoning by asking the model to "think through" problems.</p>
-                <div class="code-block">
-"Let's solve this step by step:
-1. First, identify the key information
-2. Then, apply the relevant formula
-3. Finally, calculate the result"
-                </div>
-                
-                <h3>Role Assignment</h3>
-                <p>Assign a specific role or persona to the model for better context.</p>
-                <div class="code-block">
-"You are an expert Python developer with 10 years of experience. Explain list comprehensions to a beginner."
-                </div>
-                
-                <h2>Best Practices</h2>
-                <ul>
-                    <li>Start simple, then iterate</li>
-                    <li>Use delimiters to separate sections</li>
-                    <li>Specify constraints (length, tone, style)</li>
-                    <li>Test with edge cases</li>
-                    <li>Version control your prompts</li>
-                </ul>
-            """,
-            "demo": {
-                "type": "prompt_tester",
-                "description": "Test different prompting techniques and see results"
-            }
-        }
-    },
-    # Add more courses...
-]
-
-def create_course_html(course):
-    """Generate HTML for a course"""
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Course {course['id']}: {course['title']}</title>
-    <link rel="stylesheet" href="../shared/course-styles.css">
-    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-</head>
-<body>
-    <nav class="navbar">
-        <a href="../index.html" class="back-btn">← Back to Courses</a>
-        <h2>Course {course['id']}: {course['title']}</h2>
-        <button class="complete-btn" onclick="markCourseComplete()">Mark Complete ✓</button>
-    </nav>
-
-    <div class="container">
-        <div class="sidebar">
-            <div class="course-info">
-                <h3>Course {course['id']}</h3>
-                <p class="level-badge level-{course['level']}">{course['level'].upper()}</p>
-                <p class="duration">⏱️ 2h</p>
-            </div>
-            
-            <div class="toc">
-                <h4>Table of Contents</h4>
-                <ul id="tocList"></ul>
-            </div>
-
-            <div class="progress-section">
-                <h4>Your Progress</h4>
-                <div class="progress-bar">
-                    <div class="progress-fill" id="sectionProgress">0%</div>
-                </div>
-            </div>
-        </div>
-
-        <main class="content" id="courseContent">
-            {course['content']['theory']}
-        </main>
+    }
 
-        <aside class="demo-panel">
-            <h3>🚀 Interactive Demo</h3>
-            <div id="demoControls"></div>
-            <div id="demoOutput"></div>
-            <div id="demoVisuals"></div>
-        </aside>
-    </div>
+def create_course_html(course, vendored_charts=False, urls=None):
+    """Generate HTML for a course from shared/course-template.html
 
-    <script src="../shared/course-utils.js"></script>
-    <script src="course.js"></script>
-</body>
-</html>"""
+    Only the chart libraries course.js uses are loaded, from the CDN or, with
+    `vendored_charts`, from shared/vendor/. `urls` points the page at fingerprinted
+    shared assets, see shared_assets.asset_urls().
+    """
+    chart_scripts = chart_script_tags(detect_chart_libraries(create_course_js(course)), vendored_charts)
+    return load_template().render(course_page_values(
+        course['id'], course['title'], course['level'],
+        course.get('duration', '2h'), course['content']['theory'], chart_scripts=chart_scripts, urls=urls
+    ))
 
 def create_course_js(course):
     """Generate JavaScript for course interactivity"""
@@ -361,20 +216,26 @@ function analyzePrompt(prompt, technique) {
     
     return "// Course JavaScript placeholder"
 
-def generate_all_courses():
+def generate_all_courses(base_path=BASE_PATH):
     """Generate all 100 courses"""
-    base_path = "c:/Users/wjbea/Downloads/learnbydoingwithsteven/agentic_sys_0-1"
+    catalog = catalog_by_id(os.path.join(base_path, 'courses-data.js'))
+    _, duplicates, _ = build_folder_index(base_path, catalog.values())
+    report_folder_problems(duplicates)
+    urls = asset_urls(publish_shared_assets(base_path))
     
     # Create first 2 courses as examples
-    for course in COURSES[:2]:
-        folder_name = f"course_{course['id']:03d}_{course['title'].lower().replace(' ', '_').replace('&', 'and')}"
+    for course_id in default_store().ids('courses')[:2]:
+        course = load_course(course_id)
+        # Catalog fields (description, tags, duration, ...) fill in what the content store omits
+        course = {**catalog.get(course['id'], {}), **course}
+        folder_name = resolve_folder(course)
         course_path = os.path.join(base_path, folder_name)
         
         os.makedirs(course_path, exist_ok=True)
         
         # Create HTML
-        with open(os.path.join(course_path, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(create_course_html(course))
+        with open(os.path.join(course_path, 'index.html'), 'wb') as f:
+            f.write(create_course_html(course, urls=urls))
         
         # Create JS
         with open(os.path.join(course_path, 'course.js'), 'w', encoding='utf-8') as f:
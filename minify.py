@@ -0,0 +1,269 @@
+"""
+Whitespace and comment minification for generated course HTML and JS
+HTML: comments are dropped and whitespace runs collapse to one space, or vanish next to
+block-level tags; quoted attribute values are kept byte for byte; <pre>, <textarea>, <script>, <style> and class="code-block" elements
+are copied verbatim. JS: comments are dropped, indentation and blank lines removed and
+spaces around punctuation squeezed; strings, template literals and regex literals are
+copied verbatim, and line breaks are kept wherever removing one could change how
+semicolons are inserted. Results are cached on disk by input hash
+
+Usage: python minify.py FILE [FILE ...]
+"""
+
+import os
+import re
+import sys
+import hashlib
+
+from atomic_io import write_atomic
+
+# Bump when minifier output changes so cached results are not reused
+MINIFY_VERSION = 2
+CACHE_DIR = ".minify-cache"
+
+# ---- HTML ----
+
+BLOCK_TAGS = frozenset("""
+    html head body title meta link base script style noscript template
+    main nav aside header footer section article div p h1 h2 h3 h4 h5 h6
+    ul ol li dl dt dd table thead tbody tfoot tr td th caption form fieldset
+    legend hr br pre blockquote figure figcaption canvas select option
+""".split())
+VERBATIM_TAGS = ('pre', 'textarea', 'script', 'style')
+
+HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+HTML_TOKEN_RE = re.compile(r'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<(?:[^>"\']|"[^"]*"|\'[^\']*\')*>|[^<]+|<', re.S)
+TAG_NAME_RE = re.compile(r'</?\s*([A-Za-z][A-Za-z0-9-]*)')
+VERBATIM_OPEN_RE = re.compile(
+    r'<(' + '|'.join(VERBATIM_TAGS) + r')\b[^>]*>'
+    r'|<div\b[^>]*\bclass\s*=\s*["\'][^"\']*\bcode-block\b[^"\']*["\'][^>]*>',
+    re.I
+)
+DIV_RE = re.compile(r'<(/?)div\b[^>]*>', re.I)
+WS_RE = re.compile(r'\s+')
+# Inside a tag: a quoted attribute value, kept as is, or a whitespace run between attributes
+TAG_WS_RE = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+
+
+def _verbatim_end(html, match):
+    """End offset of the verbatim element opened by `match`"""
+    tag = match.group(1)
+    if tag:
+        close = re.compile(r'</' + tag + r'\s*>', re.I).search(html, match.end())
+        return close.end() if close else len(html)
+    # code-block divs may nest other divs; find the matching </div>
+    depth = 1
+    for div in DIV_RE.finditer(html, match.end()):
+        depth += -1 if div.group(1) else 1
+        if depth == 0:
+            return div.end()
+    return len(html)
+
+
+def _is_block(tag):
+    """Whether a tag token is a block-level element, around which whitespace is insignificant"""
+    if tag.startswith('<!'):
+        return True
+    name = TAG_NAME_RE.match(tag)
+    return bool(name) and name.group(1).lower() in BLOCK_TAGS
+
+
+def _minify_html_run(html):
+    """Minify HTML containing no verbatim elements"""
+    tokens = HTML_TOKEN_RE.findall(HTML_COMMENT_RE.sub('', html))
+    out = []
+    for i, token in enumerate(tokens):
+        if token.startswith('<') and len(token) > 1:
+            out.append(TAG_WS_RE.sub(lambda m: m.group(1) or ' ', token))
+            continue
+        text = WS_RE.sub(' ', token)
+        prev_block = i == 0 or _is_block(tokens[i - 1])
+        next_block = i == len(tokens) - 1 or _is_block(tokens[i + 1])
+        if prev_block:
+            text = text.lstrip(' ')
+        if next_block:
+            text = text.rstrip(' ')
+        if text:
+            out.append(text)
+    return ''.join(out)
+
+
+def minify_html(html):
+    """Collapse insignificant whitespace and drop comments, keeping verbatim elements intact"""
+    out = []
+    pos = 0
+    for match in VERBATIM_OPEN_RE.finditer(html):
+        if match.start() < pos:
+            continue
+        end = _verbatim_end(html, match)
+        out.append(_minify_html_run(html[pos:match.start()]))
+        out.append(html[match.start():end])
+        pos = end
+    out.append(_minify_html_run(html[pos:]))
+    return ''.join(out)
+
+
+# ---- JS ----
+
+JS_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | (?P<template>`)
+  | (?P<word>[\w$\u0080-\uffff]+)
+  | (?P<punct>.)
+""", re.S | re.X)
+# Body of a template literal up to its closing backtick or the next ${
+TEMPLATE_CHUNK_RE = re.compile(r'(?:\\.|\$(?!\{)|[^`\\$])*', re.S)
+REGEX_RE = re.compile(r'/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*')
+
+# A '/' after these words starts a regex, not a division
+REGEX_KEYWORDS = frozenset('return typeof instanceof in of new delete void throw case do else yield await'.split())
+# Spaces next to these characters never matter
+SQUEEZE = frozenset('{}()[];,:=<>?!&|*%+-~^')
+# A line break after/before these can go without changing semicolon insertion
+JOIN_AFTER = frozenset('{;,([')
+JOIN_BEFORE = frozenset('}]).')
+
+
+def _join(prev, pending, nxt):
+    """The separator to keep between two tokens given the whitespace between them"""
+    if not pending or not prev:
+        return ''
+    if pending == '\n':
+        return '' if prev in JOIN_AFTER or nxt in JOIN_BEFORE else '\n'
+    if prev in '+-' and nxt in '+-':
+        return ' '
+    return '' if prev in SQUEEZE or nxt in SQUEEZE else ' '
+
+
+def minify_js(source):
+    """Drop comments and insignificant whitespace from JS source"""
+    out = []
+    pending = ''
+    last_token = ''
+    # Brace depth inside each open ${...} template substitution, innermost last
+    substitutions = []
+    pos = 0
+    n = len(source)
+
+    def emit(text):
+        nonlocal pending
+        prev = out[-1][-1] if out else ''
+        sep = _join(prev, pending, text[0])
+        if sep:
+            out.append(sep)
+        out.append(text)
+        pending = ''
+
+    def scan_template(start):
+        """Copy a template literal body from `start`, returning where code resumes"""
+        chunk = TEMPLATE_CHUNK_RE.match(source, start)
+        end = chunk.end()
+        if source.startswith('${', end):
+            out.append(source[start:end + 2])
+            substitutions.append(0)
+            return end + 2
+        out.append(source[start:end + 1])
+        return end + 1
+
+    while pos < n:
+        match = JS_TOKEN_RE.match(source, pos)
+        kind, text = match.lastgroup, match.group()
+        pos = match.end()
+
+        if kind in ('ws', 'comment'):
+            if '\n' in text or kind == 'comment' and text.startswith('//'):
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            continue
+
+        if kind == 'template':
+            emit('`')
+            pos = scan_template(pos)
+            last_token = '`'
+            continue
+
+        if kind == 'punct' and substitutions:
+            if text == '{':
+                substitutions[-1] += 1
+            elif text == '}':
+                if substitutions[-1] == 0:
+                    # End of a ${...}: back inside the enclosing template literal
+                    substitutions.pop()
+                    out.append('}')
+                    pending = ''
+                    pos = scan_template(pos)
+                    last_token = '`'
+                    continue
+                substitutions[-1] -= 1
+
+        if kind == 'punct' and text == '/':
+            starts_word = last_token[:1].isalnum() or last_token[:1] in ('_', '$')
+            is_division = (last_token[-1:] in (')', ']') or starts_word) and last_token not in REGEX_KEYWORDS
+            regex = None if is_division else REGEX_RE.match(source, match.start())
+            if regex:
+                text = regex.group()
+                pos = regex.end()
+
+        emit(text)
+        last_token = text
+    return ''.join(out) + ('\n' if source.endswith('\n') else '')
+
+
+# ---- Cache ----
+
+MINIFIERS = {'html': minify_html, 'js': minify_js}
+
+
+class MinifyCache:
+    """Content-addressed store of minified output under root/<key[:2]>/<key>
+
+    Entries are never invalidated, only keyed by the minifier version; delete the
+    directory to reclaim space.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def key(self, kind, source):
+        """Cache key for minifying `source` as `kind`"""
+        digest = hashlib.sha256(f"{MINIFY_VERSION}\0{kind}\0".encode('utf-8'))
+        digest.update(source)
+        return digest.hexdigest()
+
+    def minify(self, kind, source):
+        """Minify bytes as 'html' or 'js', reusing a cached result when the input is unchanged"""
+        key = self.key(kind, source)
+        path = os.path.join(self.root, key[:2], key)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        result = MINIFIERS[kind](source.decode('utf-8')).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, result)
+        return result
+
+
+def kind_for(filename):
+    """Minifier kind for a file name, or None if it is not minified"""
+    if filename.endswith('.html'):
+        return 'html'
+    if filename.endswith('.js'):
+        return 'js'
+    return None
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        kind = kind_for(path)
+        if kind is None:
+            print(f"⚠️ Skipping {path}: not .html or .js")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        result = MINIFIERS[kind](source)
+        print(f"📉 {path}: {len(source.encode('utf-8'))} -> {len(result.encode('utf-8'))} bytes")
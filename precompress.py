@@ -0,0 +1,284 @@
+"""
+Build-time precompression of generated course assets
+Writes .gz (and, when the brotli module is installed, .br) siblings at maximum
+compression next to every servable file, so the static tier can send precompressed
+bytes instead of compressing per request. Files whose content hash is unchanged since
+the last run are skipped. .precompress-manifest.json maps each source path to its
+encoded siblings:
+
+    {"encodings": ["br", "gzip"],
+     "files": {"course_001_intro_agents/index.html": {
+        "sha256": "...", "size": 11234,
+        "encodings": {"br": {"path": "course_001_intro_agents/index.html.br", "size": 2710},
+                      "gzip": {"path": "course_001_intro_agents/index.html.gz", "size": 3105}}}}}
+
+A server picks the first encoding the client accepts, preferring br, and sends its
+path with Content-Encoding set; paths without an entry are served as is.
+
+Usage: python precompress.py [--jobs N] [directory]
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import catalog_shards
+from atomic_io import write_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = ".precompress-manifest.json"
+COMPRESSIBLE = ('.html', '.js', '.css', '.json', '.svg', '.txt')
+SHARED_DIR = "shared"
+# Inputs of the build that sit in the served tree but are never served themselves
+BUILD_SOURCES = {'generate_all_courses.js', 'shared/course-template.html'}
+
+# Content-Encoding name -> file suffix, in server preference order
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings():
+    """Encodings this interpreter can produce, in server preference order"""
+    return [name for name in SUFFIXES if name != 'br' or brotli is not None]
+
+
+def compress(data, encoding):
+    """Compress bytes at maximum compression
+
+    gzip output carries mtime 0 so identical input always gives identical bytes.
+    """
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+    raise ValueError(f"Unknown encoding {encoding!r}")
+
+
+def remove_siblings(base_path, entry):
+    """Delete the encoded siblings recorded in a manifest entry"""
+    for info in entry.get('encodings', {}).values():
+        try:
+            os.remove(os.path.join(base_path, info['path']))
+        except FileNotFoundError:
+            pass
+
+
+def siblings_intact(base_path, entry):
+    """Whether every sibling recorded in an entry is on disk with its recorded size"""
+    for info in entry.get('encodings', {}).values():
+        try:
+            if os.path.getsize(os.path.join(base_path, info['path'])) != info['size']:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def drop_stale(base_path):
+    """Delete the siblings of files changed or removed since they were compressed, returning how many
+
+    For builds without precompression, so a rewritten file is never served from an
+    outdated sibling; their manifest entries are dropped too.
+    """
+    manifest = load_manifest(base_path)
+    dropped = 0
+    for relpath, entry in list(manifest['files'].items()):
+        try:
+            with open(os.path.join(base_path, relpath), 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except FileNotFoundError:
+            digest = None
+        if digest != entry['sha256']:
+            remove_siblings(base_path, entry)
+            del manifest['files'][relpath]
+            dropped += 1
+    if dropped:
+        save_manifest(manifest, base_path)
+    return dropped
+
+
+def precompress_file(base_path, relpath, previous, encodings):
+    """Write the encoded siblings of one file, returning (entry, written)
+
+    Encodings that do not make the file smaller are not kept, so small files may
+    end up with no siblings at all.
+    """
+    path = os.path.join(base_path, relpath)
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if previous and previous['sha256'] == digest and siblings_intact(base_path, previous):
+        return previous, False
+
+    entry = {'sha256': digest, 'size': len(data), 'encodings': {}}
+    for encoding in encodings:
+        sibling = relpath + SUFFIXES[encoding]
+        encoded = compress(data, encoding)
+        if len(encoded) < len(data):
+            write_atomic(os.path.join(base_path, sibling), encoded)
+            entry['encodings'][encoding] = {'path': sibling, 'size': len(encoded)}
+        else:
+            try:
+                os.remove(os.path.join(base_path, sibling))
+            except FileNotFoundError:
+                pass
+    return entry, True
+
+
+def _precompress_task(task):
+    """Unpack a pool task tuple for precompress_file, returning errors as text"""
+    relpath = task[1]
+    try:
+        return (relpath,) + precompress_file(*task) + (None,)
+    except OSError as e:
+        return relpath, None, False, str(e)
+
+
+def is_compressible(name):
+    """Whether a file name has a servable text extension worth precompressing"""
+    # Dotfiles are build state (manifests, parser caches), not served
+    return name.endswith(COMPRESSIBLE) and not name.startswith('.')
+
+
+def collect_assets(base_path, course_entries=()):
+    """Relative paths of every servable file: course files, shared/*, catalog/* and top-level pages
+
+    `course_entries` are build manifest entries; their recorded files are used
+    instead of scanning every course folder. Dotfiles, dot directories and
+    BUILD_SOURCES are left out.
+    """
+    assets = set()
+    for entry in course_entries:
+        for filename in entry.get('files', {}):
+            assets.add(f"{entry['folder']}/{filename}")
+
+    with os.scandir(base_path) as entries:
+        for entry in entries:
+            if entry.is_file() and is_compressible(entry.name):
+                assets.add(entry.name)
+
+    for directory in (SHARED_DIR, catalog_shards.SHARD_DIR):
+        for dirpath, dirnames, filenames in os.walk(os.path.join(base_path, directory)):
+            dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+            reldir = os.path.relpath(dirpath, base_path).replace(os.sep, '/')
+            for name in filenames:
+                if is_compressible(name):
+                    assets.add(f"{reldir}/{name}")
+    return sorted(assets - BUILD_SOURCES)
+
+
+def load_manifest(base_path):
+    """Load the precompression manifest, or an empty one if missing or unreadable"""
+    try:
+        with open(os.path.join(base_path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}}
+    manifest.setdefault('files', {})
+    return manifest
+
+
+def save_manifest(manifest, base_path):
+    """Write the precompression manifest"""
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    write_atomic(os.path.join(base_path, MANIFEST_NAME), data)
+
+
+def precompress_tree(base_path, assets, jobs=1):
+    """Precompress `assets` under base_path and update the manifest
+
+    Siblings of files no longer in `assets` are deleted. Returns
+    (written, skipped, removed, failures) where failures is [(relpath, error)].
+    """
+    encodings = available_encodings()
+    manifest = load_manifest(base_path)
+    previous = manifest['files']
+    if manifest.get('encodings') != encodings:
+        # brotli was installed or removed since the last run; start from scratch
+        for entry in previous.values():
+            remove_siblings(base_path, entry)
+        previous = {}
+    current = {}
+    written = skipped = 0
+    failures = []
+
+    tasks = [(base_path, relpath, previous.get(relpath), encodings) for relpath in assets]
+    if jobs > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(_precompress_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    else:
+        executor = None
+        results = map(_precompress_task, tasks)
+
+    try:
+        for relpath, entry, was_written, error in results:
+            if error is not None:
+                failures.append((relpath, error))
+                continue
+            current[relpath] = entry
+            if was_written:
+                written += 1
+            else:
+                skipped += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    failed = {relpath for relpath, _ in failures}
+    removed = 0
+    for relpath, entry in previous.items():
+        if relpath not in current and relpath not in failed:
+            remove_siblings(base_path, entry)
+            removed += 1
+
+    manifest['encodings'] = encodings
+    manifest['files'] = current
+    save_manifest(manifest, base_path)
+    return written, skipped, removed, failures
+
+
+def report(written, skipped, removed, failures, manifest_files):
+    """Print a one-line summary of a precompression run"""
+    raw = sum(entry['size'] for entry in manifest_files.values())
+    best = sum(
+        min([entry['size']] + [info['size'] for info in entry['encodings'].values()])
+        for entry in manifest_files.values()
+    )
+    print(f"🗜️ Precompressed {written}, skipped {skipped} unchanged, removed {removed} stale "
+          f"({'+'.join(available_encodings())}; {raw / 1024:.1f} KB -> {best / 1024:.1f} KB)")
+    if brotli is None:
+        print("⚠️ brotli module not installed; wrote .gz siblings only")
+    for relpath, error in failures:
+        print(f"❌ Could not precompress {relpath}: {error}")
+
+
+def main(argv=None):
+    """Precompress a generated course tree"""
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for generated course assets")
+    parser.add_argument('directory', nargs='?', default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of worker processes (default: 1, 0 = one per CPU)")
+    args = parser.parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    with os.scandir(args.directory) as entries:
+        folders = [entry.name for entry in entries if entry.is_dir() and entry.name.startswith('course_')]
+    course_entries = [
+        {'folder': folder, 'files': {name: {} for name in os.listdir(os.path.join(args.directory, folder))
+                                     if is_compressible(name)}}
+        for folder in folders
+    ]
+    result = precompress_tree(args.directory, collect_assets(args.directory, course_entries), jobs)
+    report(*result, load_manifest(args.directory)['files'])
+    sys.exit(1 if result[3] else 0)
+
+
+if __name__ == '__main__':
+    main()
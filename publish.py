@@ -0,0 +1,184 @@
+"""
+Blue/green publishing of built course trees
+A release root holds complete generations of the site plus two symlinks:
+
+    <root>/generations/20261018-142501-3f2a/   one complete build
+    <root>/current -> generations/...          what the web server serves
+    <root>/previous -> generations/...         the generation before, kept for rollback
+
+A build stages a new generation by hard-linking the current one, so unchanged courses
+are skipped without copying bytes, and the pipeline only ever replaces files by
+rename, which never touches the live generation's inodes. Publishing repoints
+`current` with a single rename of a symlink: readers see the old tree or the new one,
+never a mix. Generations other than `current` and `previous` are deleted.
+
+Staging can live elsewhere, e.g. on tmpfs, with --staging-dir; the finished tree is
+then copied next to the other generations before the swap.
+
+Usage: python publish.py ROOT [--rollback]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+
+from atomic_io import temp_path, write_atomic
+
+GENERATIONS_DIR = "generations"
+CURRENT_LINK = "current"
+PREVIOUS_LINK = "previous"
+
+# Hand-written site files copied from the source tree into every generation
+STATIC_FILES = [
+    'index.html',
+    'app.js',
+    'courses-data.js',
+    'shared/course-styles.css',
+    'shared/course-utils.js',
+]
+STATIC_DIRS = ['shared/vendor']
+
+
+def clone_tree(src, dst):
+    """Recreate src at dst with hard links, falling back to copies across filesystems"""
+    for dirpath, dirnames, filenames in os.walk(src):
+        target_dir = os.path.join(dst, os.path.relpath(dirpath, src))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in filenames:
+            source, target = os.path.join(dirpath, name), os.path.join(target_dir, name)
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+
+
+def copy_static_site(source_root, output_root):
+    """Copy the hand-written site files that exist under source_root into output_root"""
+    paths = [path for path in STATIC_FILES if os.path.isfile(os.path.join(source_root, path))]
+    for directory in STATIC_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(source_root, directory)):
+            paths += [os.path.relpath(os.path.join(dirpath, name), source_root) for name in filenames]
+
+    for relpath in paths:
+        with open(os.path.join(source_root, relpath), 'rb') as f:
+            data = f.read()
+        target = os.path.join(output_root, relpath)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        write_atomic(target, data)
+
+
+def swap_symlink(link_path, target):
+    """Point link_path at target atomically"""
+    tmp_path = temp_path(link_path)
+    os.symlink(target, tmp_path)
+    os.replace(tmp_path, link_path)
+
+
+class ReleaseRoot:
+    """A directory of site generations with `current` and `previous` symlinks"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.generations = os.path.join(self.root, GENERATIONS_DIR)
+
+    def generation(self, link):
+        """Generation name a symlink points at, or None"""
+        try:
+            return os.path.basename(os.readlink(os.path.join(self.root, link)))
+        except OSError:
+            return None
+
+    def path(self, name):
+        """Absolute path of a generation"""
+        return os.path.join(self.generations, name)
+
+    def new_name(self):
+        """A fresh generation name that sorts by creation time"""
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(2).hex()}"
+
+    def stage(self, staging_dir=None):
+        """Create a staging tree seeded from the current generation and return its path
+
+        By default the staging tree is a future generation directory, so publishing
+        is a rename away. With `staging_dir`, e.g. on tmpfs, it is built there instead.
+        """
+        name = self.new_name()
+        if staging_dir:
+            staging = os.path.join(os.path.abspath(staging_dir), name)
+        else:
+            staging = self.path(name) + '.staging'
+        os.makedirs(staging)
+        current = self.generation(CURRENT_LINK)
+        if current:
+            clone_tree(self.path(current), staging)
+        return staging
+
+    def publish(self, staging):
+        """Move a finished staging tree into place and make it current
+
+        Returns the new generation's name.
+        """
+        name = os.path.basename(staging).removesuffix('.staging')
+        target = self.path(name)
+        os.makedirs(self.generations, exist_ok=True)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Staged on another filesystem: copy next to the other generations first
+            clone_tree(staging, target + '.staging')
+            os.rename(target + '.staging', target)
+            shutil.rmtree(staging)
+
+        current = self.generation(CURRENT_LINK)
+        swap_symlink(os.path.join(self.root, CURRENT_LINK), os.path.join(GENERATIONS_DIR, name))
+        if current:
+            swap_symlink(os.path.join(self.root, PREVIOUS_LINK), os.path.join(GENERATIONS_DIR, current))
+        self.prune()
+        return name
+
+    def rollback(self):
+        """Swap `current` and `previous`, returning the generation now current"""
+        current, previous = self.generation(CURRENT_LINK), self.generation(PREVIOUS_LINK)
+        if not previous:
+            raise ValueError(f"No previous generation to roll back to in {self.root}")
+        swap_symlink(os.path.join(self.root, CURRENT_LINK), os.path.join(GENERATIONS_DIR, previous))
+        swap_symlink(os.path.join(self.root, PREVIOUS_LINK), os.path.join(GENERATIONS_DIR, current))
+        return previous
+
+    def discard(self, staging):
+        """Delete a staging tree that will not be published"""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def prune(self):
+        """Delete generations other than `current` and `previous`, returning how many"""
+        keep = {self.generation(CURRENT_LINK), self.generation(PREVIOUS_LINK)}
+        removed = 0
+        for name in os.listdir(self.generations):
+            if name not in keep and not name.endswith('.staging'):
+                shutil.rmtree(self.path(name))
+                removed += 1
+        return removed
+
+
+def main(argv=None):
+    """Show or roll back the published generation"""
+    parser = argparse.ArgumentParser(description="Inspect or roll back a blue/green release root")
+    parser.add_argument('root', help="release root given to build_pipeline.py --release-root")
+    parser.add_argument('--rollback', action='store_true', help="make the previous generation current again")
+    args = parser.parse_args(argv)
+
+    release = ReleaseRoot(args.root)
+    if args.rollback:
+        try:
+            name = release.rollback()
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"⏪ Rolled back to generation {name}")
+    print(f"📦 current: {release.generation(CURRENT_LINK)}, previous: {release.generation(PREVIOUS_LINK)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""
+Shared, content-addressed cache of rendered courses
+A course's rendered files depend only on its catalog record, its content entries and
+fragments, the page template, the shared asset URLs, the build flags and the generator
+code. build_pipeline.py --render-cache DIR hashes all of those before rendering and
+looks the key up under DIR/<key[:2]>/<key>; a hit restores the rendered files instead
+of running the render stages. DIR can be a shared NFS path, so CI runners and laptops
+reuse each other's renders.
+
+An entry is one file: a JSON header line, then the files' bytes back to back:
+
+    {"version": 1, "sha256": "<of the payload>", "hash": "<build input hash>",
+     "demo": "shared/demos/....js", "deps": [...], "minified": {...},
+     "files": [["index.html", 11234], ...], "shared": [["shared/demos/....js", 2048]]}
+
+Entries are written by temp file and rename, and a payload that fails its hash is
+treated as a miss. Hits bump the entry's mtime, so evicting the oldest mtimes first
+keeps the cache under its size bound in least-recently-used order.
+
+Usage: python render_cache.py DIR [--max-size SIZE]
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import importlib
+
+from atomic_io import temp_path
+
+CACHE_VERSION = 1
+
+# Modules whose code decides what a course renders to
+GENERATOR_MODULES = [
+    'build_pipeline', 'build_all_courses', 'generate_course_apps', 'course_template',
+    'course_folders', 'content_store', 'minify',
+]
+SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([KMGT]?)B?$', re.I)
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_size(text):
+    """Bytes in a size such as '500M' or '2G'"""
+    match = SIZE_RE.match(text.strip())
+    if not match:
+        raise ValueError(f"Not a size: {text!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def generator_version():
+    """Digest of the cache format and the source of every generator module"""
+    digest = hashlib.sha256(f"render-cache {CACHE_VERSION}".encode('utf-8'))
+    for name in GENERATOR_MODULES:
+        module = importlib.import_module(name)
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Rendered course outputs stored under root/<key[:2]>/<key>
+
+    The hit/miss counters are kept by the parent process; pool workers only report
+    what happened for each course.
+    """
+
+    def __init__(self, root, max_bytes=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        """File holding the entry for a key"""
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """The cached rendering for a key as (header, {name: bytes}, {relpath: bytes}), or None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                payload = f.read()
+        except (OSError, ValueError):
+            return None
+        if header.get('version') != CACHE_VERSION or hashlib.sha256(payload).hexdigest() != header.get('sha256'):
+            return None
+        try:
+            # Mark as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+
+        offset = 0
+        sections = []
+        for pairs in (header['files'], header['shared']):
+            section = {}
+            for name, size in pairs:
+                section[name] = payload[offset:offset + size]
+                offset += size
+            sections.append(section)
+        return header, sections[0], sections[1]
+
+    def put(self, key, header, files, shared):
+        """Store a rendering; files and shared map names to bytes"""
+        payload = b''.join(list(files.values()) + list(shared.values()))
+        header = dict(
+            header,
+            version=CACHE_VERSION,
+            sha256=hashlib.sha256(payload).hexdigest(),
+            files=[[name, len(data)] for name, data in files.items()],
+            shared=[[relpath, len(data)] for relpath, data in shared.items()],
+        )
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = temp_path(path)
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header, sort_keys=True, separators=(',', ':')).encode('utf-8') + b'\n')
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def record(self, status):
+        """Count a worker's 'hit' or 'miss'"""
+        if status == 'hit':
+            self.hits += 1
+        elif status == 'miss':
+            self.misses += 1
+
+    def entries(self):
+        """[(mtime, size, path)] for every entry, oldest first"""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    # Evicted by another build meanwhile
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the cache fits max_bytes
+
+        Returns (entries removed, bytes removed).
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = removed_bytes = 0
+        for _, size, path in entries:
+            if max_bytes is None or total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            removed_bytes += size
+        return removed, removed_bytes
+
+    def stats(self):
+        """{'entries', 'bytes', 'oldest', 'newest'} for the cache directory"""
+        entries = self.entries()
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'oldest': entries[0][0] if entries else None,
+            'newest': entries[-1][0] if entries else None,
+        }
+
+    def report(self, evicted=(0, 0)):
+        """Print this build's hit rate and the cache's size"""
+        lookups = self.hits + self.misses
+        stats = self.stats()
+        bound = f" of {self.max_bytes / 1024 ** 2:.1f} MB" if self.max_bytes else ""
+        print(f"🗄️ Render cache: {self.hits} hits, {self.misses} misses" +
+              (f" ({self.hits / lookups:.0%} hit rate)" if lookups else "") +
+              f"; {stats['entries']} entries, {stats['bytes'] / 1024 ** 2:.1f} MB{bound}" +
+              (f", evicted {evicted[0]} ({evicted[1] / 1024 ** 2:.1f} MB)" if evicted[0] else ""))
+
+
+def main(argv=None):
+    """Print cache statistics, evicting down to --max-size first if given"""
+    parser = argparse.ArgumentParser(description="Inspect or trim a shared render cache")
+    parser.add_argument('directory')
+    parser.add_argument('--max-size', type=parse_size, help="evict least recently used entries down to this size")
+    args = parser.parse_args(argv)
+
+    cache = RenderCache(args.directory, args.max_size)
+    if args.max_size is not None:
+        removed, removed_bytes = cache.evict()
+        print(f"🧹 Evicted {removed} entries ({removed_bytes / 1024 ** 2:.1f} MB)")
+    stats = cache.stats()
+    print(f"🗄️ {args.directory}: {stats['entries']} entries, {stats['bytes'] / 1024 ** 2:.1f} MB")
+    if stats['entries']:
+        for label in ('oldest', 'newest'):
+            print(f"   {label} use: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats[label]))}")
+
+
+if __name__ == '__main__':
+    main()
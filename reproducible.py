@@ -0,0 +1,199 @@
+"""
+Reproducible builds of the course tree
+build_pipeline.py --reproducible makes a build a pure function of its inputs: files are
+written in catalog order as UTF-8 with '\\n' newlines, and every generated file and
+directory gets its mtime set to the input commit time (SOURCE_DATE_EPOCH when set,
+otherwise the commit time of HEAD) instead of the wall clock. Rebuilding an unchanged
+commit then leaves sizes and mtimes alone, so rsync and CDN syncs only move real changes.
+
+`python reproducible.py` checks the claim: it builds the catalog twice into fresh
+directories, with different worker counts and hash seeds, and fails unless the two
+trees are byte-identical, mtimes included.
+
+Usage: python reproducible.py [--base-path DIR] [--keep] [-- build_pipeline options]
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+import publish
+import minify
+import precompress
+import search_index
+import catalog_shards
+import shared_assets
+import build_pipeline
+from atomic_io import temp_path
+from build_all_courses import DEMOS_DIR
+
+# Catalog-wide outputs of a build, relative to the output root
+OUTPUT_FILES = [
+    build_pipeline.MANIFEST_NAME,
+    precompress.MANIFEST_NAME,
+    shared_assets.MANIFEST_NAME,
+    search_index.INDEX_NAME,
+]
+OUTPUT_DIRS = [DEMOS_DIR, shared_assets.ASSETS_DIR, catalog_shards.SHARD_DIR]
+
+
+def is_cache(name):
+    """Whether a file or directory name is a build cache rather than part of the site"""
+    return name == minify.CACHE_DIR or (name.startswith('.') and '.cache.' in name)
+
+
+def source_date_epoch(base_path):
+    """The timestamp generated files are stamped with
+
+    SOURCE_DATE_EPOCH wins; otherwise the HEAD commit time of the git checkout holding
+    base_path, or failing that the one holding the build scripts.
+    """
+    if os.environ.get('SOURCE_DATE_EPOCH'):
+        return int(os.environ['SOURCE_DATE_EPOCH'])
+    for path in (base_path, os.path.dirname(os.path.abspath(__file__))):
+        try:
+            result = subprocess.run(['git', '-C', path, 'log', '-1', '--format=%ct'],
+                                    capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            continue
+        if result.stdout.strip():
+            return int(result.stdout.strip())
+    raise ValueError("No git commit to take the input time from; set SOURCE_DATE_EPOCH")
+
+
+def output_files(base_path, course_entries, static=False):
+    """Sorted relative paths of every file and directory a build wrote under base_path
+
+    `course_entries` are build manifest entries. `static` adds the hand-written site
+    files, which are outputs only in a staged release tree.
+    """
+    paths = set()
+    course_entries = list(course_entries)
+    for entry in course_entries:
+        paths.add(entry['folder'])
+        paths.update(f"{entry['folder']}/{name}" for name in entry.get('files', {}))
+    paths.update(OUTPUT_FILES)
+    for directory in OUTPUT_DIRS + (publish.STATIC_DIRS if static else []):
+        for dirpath, _, filenames in os.walk(os.path.join(base_path, directory)):
+            reldir = os.path.relpath(dirpath, base_path).replace(os.sep, '/')
+            paths.add(reldir)
+            paths.update(f"{reldir}/{name}" for name in filenames)
+    if static:
+        paths.update(publish.STATIC_FILES)
+
+    # Precompressed siblings are outputs even when their original is a source file
+    servable = paths | set(precompress.collect_assets(base_path, course_entries))
+    paths.update(f"{path}{suffix}" for path in servable for suffix in precompress.SUFFIXES.values())
+    return sorted(path for path in paths if os.path.lexists(os.path.join(base_path, *path.split('/'))))
+
+
+def normalize_mtimes(base_path, relpaths, epoch):
+    """Set the mtime of each path to `epoch`, returning how many changed
+
+    A file hard-linked from the live generation (see publish.py) is copied first so
+    the live copy keeps its own timestamps.
+    """
+    changed = 0
+    # Deepest first, so stamping a file does not disturb its directory afterwards
+    for relpath in sorted(relpaths, key=lambda path: path.count('/'), reverse=True):
+        path = os.path.join(base_path, *relpath.split('/'))
+        stat = os.stat(path)
+        if int(stat.st_mtime) == epoch and stat.st_mtime_ns % 1_000_000_000 == 0:
+            continue
+        if os.path.isfile(path) and stat.st_nlink > 1:
+            tmp_path = temp_path(path)
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, path)
+        os.utime(path, (epoch, epoch))
+        changed += 1
+    return changed
+
+
+def tree_state(root):
+    """{relpath: (kind, sha256 or None, mtime)} for everything under root except caches"""
+    state = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not is_cache(name))
+        filenames = [name for name in filenames if not is_cache(name)]
+        for name in dirnames:
+            path = os.path.join(dirpath, name)
+            state[os.path.relpath(path, root)] = ('dir', None, os.stat(path).st_mtime_ns)
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            state[os.path.relpath(path, root)] = ('file', digest, os.stat(path).st_mtime_ns)
+    return state
+
+
+def compare_trees(first, second):
+    """Descriptions of every difference between two trees, or [] if identical"""
+    a, b = tree_state(first), tree_state(second)
+    differences = []
+    for relpath in sorted(a.keys() | b.keys()):
+        if relpath not in a or relpath not in b:
+            differences.append(f"{relpath}: only in {'first' if relpath in a else 'second'} build")
+        elif a[relpath][:2] != b[relpath][:2]:
+            differences.append(f"{relpath}: contents differ")
+        elif a[relpath][0] == 'file' and a[relpath][2] != b[relpath][2]:
+            differences.append(f"{relpath}: mtimes differ")
+    return differences
+
+
+def copy_inputs(base_path, target):
+    """Copy the catalog and hand-written site files, timestamps kept, into a fresh tree"""
+    for relpath in ['courses-data.js'] + publish.STATIC_FILES:
+        source = os.path.join(base_path, relpath)
+        if os.path.isfile(source):
+            os.makedirs(os.path.dirname(os.path.join(target, relpath)), exist_ok=True)
+            shutil.copy2(source, os.path.join(target, relpath))
+
+
+def verify(base_path, build_args=(), keep=False):
+    """Build twice from scratch and compare the trees, returning the differences"""
+    epoch = source_date_epoch(base_path)
+    workdir = tempfile.mkdtemp(prefix='reproducible-')
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build_pipeline.py')
+    trees = []
+    try:
+        # Vary what must not matter: worker count and set/dict hash order
+        for name, jobs, seed in (('first', '1', '1'), ('second', '0', '2')):
+            tree = os.path.join(workdir, name)
+            copy_inputs(base_path, tree)
+            env = dict(os.environ, PYTHONHASHSEED=seed, SOURCE_DATE_EPOCH=str(epoch))
+            subprocess.run([sys.executable, script, '--base-path', tree, '--jobs', jobs, '--reproducible',
+                            *build_args], env=env, check=True, stdout=subprocess.DEVNULL)
+            trees.append(tree)
+        return compare_trees(*trees)
+    finally:
+        if keep:
+            print(f"📁 Builds kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    """Build twice and exit non-zero unless the outputs are identical"""
+    parser = argparse.ArgumentParser(description="Check that two builds of the catalog are byte-identical")
+    parser.add_argument('--base-path', default=build_pipeline.BASE_PATH,
+                        help="directory holding courses-data.js and the site files")
+    parser.add_argument('--keep', action='store_true', help="keep both build trees for inspection")
+    parser.add_argument('build_args', nargs='*', help="extra build_pipeline.py options, after --")
+    args = parser.parse_args(argv)
+
+    differences = verify(args.base_path, args.build_args, args.keep)
+    if differences:
+        for difference in differences[:50]:
+            print(f"❌ {difference}")
+        if len(differences) > 50:
+            print(f"... and {len(differences) - 50} more")
+        sys.exit(1)
+    print("✅ Both builds are byte-identical, mtimes included")
+
+
+if __name__ == '__main__':
+    main()
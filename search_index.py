@@ -0,0 +1,159 @@
+"""
+Prebuilt search index for the course catalog page
+Titles, descriptions, tags and, for courses with detailed content, theory text are
+split into lowercase alphanumeric terms. The theory terms are kept in a sidecar cache
+next to the content store, keyed by each fragment's mtime and size, so an unchanged
+catalog is indexed without reading any fragment. search-index.json holds the terms in sorted order and, per term, the ids of the
+courses containing it as a gap-encoded integer array:
+
+    {"version": 1, "terms": ["agent", "agents", ...], "postings": [[1, 1, 3, 40], ...]}
+
+so [1, 1, 3, 40] is courses 1, 2, 5, 45. app.js fetches the file on the first search,
+finds every term starting with each query word by binary search over `terms`, and
+intersects the postings, instead of scanning every course per keystroke.
+
+Usage: python search_index.py [directory]
+"""
+
+import os
+import re
+import sys
+import json
+from bisect import bisect_left
+
+from atomic_io import write_atomic, write_if_changed
+from content_store import default_store
+
+INDEX_NAME = "search-index.json"
+INDEX_VERSION = 1
+TERMS_CACHE_NAME = ".search-terms.cache.json"
+
+# Must match tokenize() in app.js
+TERM_RE = re.compile(r'[a-z0-9]+')
+TAG_RE = re.compile(r'<[^>]*>')
+ENTITY_RE = re.compile(r'&[#a-z0-9]+;')
+MIN_TERM_LENGTH = 2
+
+
+def tokenize(text):
+    """Distinct search terms in plain text"""
+    return {term for term in TERM_RE.findall(text.lower()) if len(term) >= MIN_TERM_LENGTH}
+
+
+def html_text(html):
+    """Visible text of an HTML fragment, near enough for indexing"""
+    return ENTITY_RE.sub(' ', TAG_RE.sub(' ', html))
+
+
+def course_terms(record, theory=''):
+    """Search terms for one catalog record and its theory HTML"""
+    parts = [record.get('title', ''), record.get('description', ''), ' '.join(record.get('tags', []))]
+    return tokenize(' '.join(parts) + ' ' + html_text(theory))
+
+
+def theory_terms(courses, store=None):
+    """{course_id: sorted theory terms} for the courses with a build content entry
+
+    Terms of fragments unchanged since the last call come from the sidecar cache.
+    """
+    store = store or default_store()
+    cache_path = os.path.join(store.root, TERMS_CACHE_NAME)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        cached = cached['courses'] if cached.get('version') == INDEX_VERSION else {}
+    except (OSError, ValueError, KeyError, AttributeError):
+        cached = {}
+
+    terms = {}
+    fresh = {}
+    for record in courses:
+        entry = store.entry('build', record['id'])
+        if entry is None:
+            # The default theory only repeats the title around boilerplate every such course shares
+            continue
+        stat = os.stat(store.fragment_path('build', record['id'], 'theory'))
+        key = [entry['sections']['theory'], stat.st_mtime_ns, stat.st_size]
+        hit = cached.get(str(record['id']))
+        if hit and hit.get('key') == key:
+            found = hit['terms']
+        else:
+            found = sorted(tokenize(html_text(store.read_text('build', record['id'], 'theory'))))
+        fresh[str(record['id'])] = {'key': key, 'terms': found}
+        terms[record['id']] = found
+
+    if fresh != cached:
+        try:
+            write_atomic(cache_path, json.dumps({'version': INDEX_VERSION, 'courses': fresh}).encode('utf-8'))
+        except OSError:
+            # A read-only content store still works, it just re-reads every time
+            pass
+    return terms
+
+
+def build_index(documents):
+    """Build the index from (course_id, terms) pairs"""
+    inverted = {}
+    for course_id, terms in documents:
+        for term in terms:
+            inverted.setdefault(term, []).append(course_id)
+
+    terms = sorted(inverted)
+    postings = []
+    for term in terms:
+        ids = sorted(set(inverted[term]))
+        postings.append([ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+    return {'version': INDEX_VERSION, 'terms': terms, 'postings': postings}
+
+
+def decode_postings(gaps):
+    """Course ids from a gap-encoded postings array"""
+    ids = []
+    total = 0
+    for gap in gaps:
+        total += gap
+        ids.append(total)
+    return ids
+
+
+def search(index, query):
+    """Ids of courses matching every query word as a term prefix, as the page does"""
+    terms = index['terms']
+    result = None
+    for word in TERM_RE.findall(query.lower()):
+        matches = set()
+        i = bisect_left(terms, word)
+        while i < len(terms) and terms[i].startswith(word):
+            matches.update(decode_postings(index['postings'][i]))
+            i += 1
+        result = matches if result is None else result & matches
+    return sorted(result or ())
+
+
+def write_index(base_path, index):
+    """Write search-index.json unless identical, returning True if written"""
+    data = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    return write_if_changed(os.path.join(base_path, INDEX_NAME), data)
+
+
+def build_search_index(base_path, courses):
+    """Index catalog records plus their build theory and write search-index.json
+
+    Returns the index.
+    """
+    theory = theory_terms(courses)
+    documents = [
+        (record['id'], course_terms(record).union(theory.get(record['id'], ())))
+        for record in courses
+    ]
+    index = build_index(documents)
+    write_index(base_path, index)
+    return index
+
+
+if __name__ == '__main__':
+    from course_catalog import load_catalog
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    index = build_search_index(root, load_catalog(os.path.join(root, 'courses-data.js')))
+    size = os.path.getsize(os.path.join(root, INDEX_NAME))
+    print(f"🔎 {len(index['terms'])} terms, {sum(map(len, index['postings']))} postings, {size / 1024:.1f} KB")
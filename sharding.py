@@ -0,0 +1,261 @@
+"""
+Sharded builds across several machines
+build_pipeline.py --shard i/N builds only the catalog records whose id hashes to shard
+i (1-based) of N, so N CI nodes can split a catalog; the partition depends only on
+the ids, never on the node or the catalog order. Each shard tree holds its own partial
+manifest, recording which shard it is and a digest of the catalog it was cut from:
+
+    {"courses": {...only this shard's courses...},
+     "shard": {"index": 2, "count": 4, "catalog": "<sha256 of the catalog records>"}}
+
+Catalog-wide outputs (search index, catalog shards) are written by shard 1 only.
+
+`python sharding.py merge OUT SHARD_TREE...` combines a complete set of shard trees
+into one tree with a single manifest. It fails, writing nothing, if the trees are
+from different catalogs or shard counts, if a shard is missing or repeated, or if two
+trees hold different bytes at the same path. `python sharding.py check N` builds the
+catalog once whole and once as N merged shards and compares the two trees.
+
+Usage: python sharding.py merge OUT SHARD_TREE [SHARD_TREE ...]
+       python sharding.py check N [--base-path DIR] [-- build_pipeline options]
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+import precompress
+import build_pipeline
+import reproducible
+
+
+def parse_shard(text):
+    """'2/4' -> (2, 4), checking 1 <= i <= N"""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} is not in 1..{count}")
+    return index, count
+
+
+def shard_of(course_id, count):
+    """1-based shard a course id belongs to out of `count`"""
+    digest = hashlib.sha256(str(course_id).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def shard_records(courses, index, count):
+    """The catalog records of shard index/count, in catalog order"""
+    return [record for record in courses if shard_of(record['id'], count) == index]
+
+
+def catalog_digest(courses):
+    """Digest identifying the catalog a shard was cut from"""
+    return hashlib.sha256(json.dumps(courses, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def shard_info(shard, courses):
+    """The manifest's 'shard' record for a (index, count) pair"""
+    index, count = shard
+    return {'index': index, 'count': count, 'catalog': catalog_digest(courses)}
+
+
+class MergeConflict(Exception):
+    """Shard trees that cannot be combined into one build"""
+
+    def __init__(self, problems):
+        super().__init__(f"{len(problems)} conflicts")
+        self.problems = problems
+
+
+# Build state merged or dropped rather than copied file by file
+MERGED_FILES = {build_pipeline.MANIFEST_NAME, precompress.MANIFEST_NAME}
+
+
+def tree_files(root):
+    """{relpath: absolute path} of the files in a shard tree, caches and merged manifests excluded"""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not reproducible.is_cache(name)]
+        for name in filenames:
+            relpath = os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, '/')
+            if relpath not in MERGED_FILES and not reproducible.is_cache(name) and not name.endswith('.tmp'):
+                files[relpath] = os.path.join(dirpath, name)
+    return files
+
+
+def file_digest(path):
+    """sha256 of a file's bytes"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def plan_merge(trees):
+    """Check a set of shard trees and work out the merged tree
+
+    Returns (manifest, precompress_manifest, {relpath: source path}); raises
+    MergeConflict listing every problem found.
+    """
+    problems = []
+    manifests = [build_pipeline.load_manifest(tree) for tree in trees]
+    shards = [manifest.get('shard') for manifest in manifests]
+    for tree, shard in zip(trees, shards):
+        if not shard:
+            problems.append(f"{tree}: not a shard build (no 'shard' in its manifest)")
+    if problems:
+        raise MergeConflict(problems)
+
+    if len({(shard['count'], shard['catalog']) for shard in shards}) > 1:
+        problems.append("trees were built from different catalogs or shard counts")
+    count = shards[0]['count']
+    indexes = sorted(shard['index'] for shard in shards)
+    if indexes != list(range(1, count + 1)):
+        problems.append(f"expected shards 1..{count} once each, got {indexes}")
+
+    courses = {}
+    owners = {}
+    for tree, manifest in zip(trees, manifests):
+        for key, entry in manifest['courses'].items():
+            if key in courses:
+                problems.append(f"course {key}: built by both {owners[key]} and {tree}")
+            courses[key] = entry
+            owners[key] = tree
+
+    encodings = None
+    compressed = {}
+    for tree in trees:
+        manifest = precompress.load_manifest(tree)
+        if not manifest['files']:
+            continue
+        if encodings is not None and manifest['encodings'] != encodings:
+            problems.append(f"{tree}: precompressed with {manifest['encodings']}, others with {encodings}")
+        encodings = manifest['encodings']
+        for relpath, info in manifest['files'].items():
+            if compressed.setdefault(relpath, info) != info:
+                problems.append(f"{relpath}: precompressed differently in {tree}")
+
+    sources = {}
+    digests = {}
+    for tree in trees:
+        for relpath, path in tree_files(tree).items():
+            if relpath not in sources:
+                sources[relpath] = path
+            elif os.path.getsize(path) != os.path.getsize(sources[relpath]) or \
+                    digests.setdefault(relpath, file_digest(sources[relpath])) != file_digest(path):
+                problems.append(f"{relpath}: differs between {sources[relpath]} and {path}")
+
+    if problems:
+        raise MergeConflict(problems)
+    manifest = {key: value for key, value in manifests[0].items() if key != 'shard'}
+    manifest['courses'] = courses
+    precompress_manifest = {'encodings': encodings or [], 'files': compressed} if compressed else None
+    return manifest, precompress_manifest, sources
+
+
+def newest_mtime(paths):
+    """Latest mtime among existing paths, or None"""
+    mtimes = [os.stat(path).st_mtime for path in paths if os.path.exists(path)]
+    return max(mtimes) if mtimes else None
+
+
+def merge(output, trees):
+    """Merge shard trees into a new directory `output`, returning the merged manifest
+
+    Raises MergeConflict before writing anything if the trees do not fit together.
+    """
+    if os.path.exists(output) and os.listdir(output):
+        raise MergeConflict([f"{output} is not empty"])
+    manifest, precompress_manifest, sources = plan_merge(trees)
+
+    for relpath, source in sorted(sources.items()):
+        target = os.path.join(output, *relpath.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(source, target)
+
+    # Merged manifests take the shards' timestamps, so reproducible shard builds merge reproducibly
+    build_pipeline.save_manifest(manifest, output)
+    written = [(build_pipeline.MANIFEST_NAME, manifest)]
+    if precompress_manifest:
+        precompress.save_manifest(precompress_manifest, output)
+        written.append((precompress.MANIFEST_NAME, precompress_manifest))
+    for name, _ in written:
+        mtime = newest_mtime([os.path.join(tree, name) for tree in trees])
+        if mtime is not None:
+            os.utime(os.path.join(output, name), (mtime, mtime))
+    for dirpath, _, _ in os.walk(output, topdown=False):
+        mtime = newest_mtime([os.path.join(tree, os.path.relpath(dirpath, output)) for tree in trees])
+        if mtime is not None:
+            os.utime(dirpath, (mtime, mtime))
+    return manifest
+
+
+def check(count, base_path, build_args=()):
+    """Build whole and as `count` merged shards, returning the differences between the trees"""
+    epoch = reproducible.source_date_epoch(base_path)
+    workdir = tempfile.mkdtemp(prefix='sharding-')
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build_pipeline.py')
+    env = dict(os.environ, SOURCE_DATE_EPOCH=str(epoch))
+    try:
+        builds = [('whole', [])] + [(f"shard{i}", ['--shard', f"{i}/{count}"]) for i in range(1, count + 1)]
+        for name, shard_args in builds:
+            tree = os.path.join(workdir, name)
+            reproducible.copy_inputs(base_path, tree)
+            subprocess.run([sys.executable, script, '--base-path', tree, '--reproducible', *shard_args, *build_args],
+                           env=env, check=True, stdout=subprocess.DEVNULL)
+        merged = os.path.join(workdir, 'merged')
+        merge(merged, [os.path.join(workdir, name) for name, _ in builds[1:]])
+        return reproducible.compare_trees(os.path.join(workdir, 'whole'), merged)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    """Merge shard trees, or check that sharding reproduces a whole build"""
+    parser = argparse.ArgumentParser(description="Merge or check sharded course builds")
+    commands = parser.add_subparsers(dest='command', required=True)
+    merge_parser = commands.add_parser('merge', help="combine shard trees into one tree")
+    merge_parser.add_argument('output', help="new or empty directory for the merged tree")
+    merge_parser.add_argument('trees', nargs='+', help="output trees of build_pipeline.py --shard i/N")
+    check_parser = commands.add_parser('check', help="compare a merged N-shard build with a whole build")
+    check_parser.add_argument('count', type=int)
+    check_parser.add_argument('--base-path', default=build_pipeline.BASE_PATH,
+                              help="directory holding courses-data.js and the site files")
+    # Build options after '--' are passed through to every build
+    argv = sys.argv[1:] if argv is None else list(argv)
+    build_args = []
+    if '--' in argv:
+        argv, build_args = argv[:argv.index('--')], argv[argv.index('--') + 1:]
+    args = parser.parse_args(argv)
+
+    if args.command == 'merge':
+        try:
+            manifest = merge(args.output, args.trees)
+        except MergeConflict as e:
+            for problem in e.problems[:50]:
+                print(f"❌ {problem}")
+            if len(e.problems) > 50:
+                print(f"... and {len(e.problems) - 50} more")
+            sys.exit(1)
+        print(f"🧩 Merged {len(args.trees)} shards, {len(manifest['courses'])} courses, into {args.output}")
+        return
+
+    try:
+        differences = check(args.count, args.base_path, build_args)
+    except MergeConflict as e:
+        differences = e.problems
+    if differences:
+        for difference in differences[:50]:
+            print(f"❌ {difference}")
+        sys.exit(1)
+    print(f"✅ {args.count} merged shards match the whole build byte for byte")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Fingerprinted copies of the shared course assets
+shared/course-styles.css and shared/course-utils.js are copied to content-hashed names
+under shared/assets/ (course-utils.3f9a1c2b7d.js) so they can be served with
+long-lived immutable caching: a changed file gets a new name, and the pages that
+reference it are rebuilt. asset-manifest.json at the output root maps each logical
+path to its fingerprinted copy and lists the directories whose files never change:
+
+    {"assets": {"shared/course-utils.js": {"path": "shared/assets/course-utils.3f9a1c2b7d.js",
+                                           "sha256": "...", "size": 7310}},
+     "immutable": ["shared/assets/", "shared/demos/"]}
+"""
+
+import os
+import json
+import hashlib
+import posixpath
+
+import precompress
+from atomic_io import write_atomic, write_if_changed
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shared')
+ASSETS_DIR = "shared/assets"
+MANIFEST_NAME = "asset-manifest.json"
+FINGERPRINT_LENGTH = 10
+
+# Logical path (relative to the output root) -> file name in SOURCE_DIR
+SHARED_ASSETS = {
+    'shared/course-styles.css': 'course-styles.css',
+    'shared/course-utils.js': 'course-utils.js',
+}
+
+# Output directories whose file names are content hashes
+IMMUTABLE_DIRS = [ASSETS_DIR + '/', 'shared/demos/']
+
+
+def fingerprinted_name(filename, data):
+    """course-utils.js -> course-utils.<hash>.js"""
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]}{extension}"
+
+
+def publish_shared_assets(base_path, source_dir=SOURCE_DIR):
+    """Copy the shared assets to fingerprinted names under base_path and write the manifest
+
+    Returns the manifest's assets mapping. Copies already on disk and an unchanged
+    manifest are not rewritten. Superseded copies stay until remove_unused_assets()
+    runs, since pages not yet rebuilt still link to them.
+    """
+    assets = {}
+    for logical, filename in SHARED_ASSETS.items():
+        with open(os.path.join(source_dir, filename), 'rb') as f:
+            data = f.read()
+        relpath = f"{ASSETS_DIR}/{fingerprinted_name(filename, data)}"
+        path = os.path.join(base_path, *relpath.split('/'))
+        if not (os.path.exists(path) and os.path.getsize(path) == len(data)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, data)
+        assets[logical] = {'path': relpath, 'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+
+    manifest = json.dumps({'assets': assets, 'immutable': IMMUTABLE_DIRS}, indent=2, sort_keys=True)
+    write_if_changed(os.path.join(base_path, MANIFEST_NAME), manifest.encode('utf-8'))
+    return assets
+
+
+def remove_unused_assets(base_path, used):
+    """Delete fingerprinted copies outside `used` (relative paths), returning how many
+
+    Precompressed siblings of the copies kept are kept with them.
+    """
+    keep = {posixpath.basename(relpath) for relpath in used}
+    keep |= {name + suffix for name in keep for suffix in precompress.SUFFIXES.values()}
+    assets_path = os.path.join(base_path, *ASSETS_DIR.split('/'))
+    removed = 0
+    for name in sorted(os.listdir(assets_path)) if os.path.isdir(assets_path) else []:
+        if name not in keep:
+            os.remove(os.path.join(assets_path, name))
+            removed += 1
+    return removed
+
+
+def asset_urls(assets=None, prefix='../'):
+    """Logical path -> URL used by course pages, fingerprinted when `assets` is given"""
+    return {
+        logical: prefix + (assets[logical]['path'] if assets and logical in assets else logical)
+        for logical in SHARED_ASSETS
+    }
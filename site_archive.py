@@ -0,0 +1,343 @@
+"""
+Single-file archive output for the course site
+build_pipeline.py --archive site.zip streams every rendered page and script into one
+zip instead of course_NNN_*/ folders, so a large catalog costs one inode instead of
+tens of thousands. Members are stored uncompressed: the zip's central directory is the
+index, and each member's bytes sit at a fixed offset, so they can be served straight
+from the file. Pool workers hand their files back to the parent, which appends them
+in catalog order; catalog-wide outputs and the hand-written site files follow. With
+--precompress, .gz/.br siblings are stored as members of their own.
+
+`python site_archive.py serve site.zip` is a small HTTP server that looks members up
+in the central directory and writes them from an mmap of the archive by offset, with
+no extraction, picking a precompressed sibling when the client accepts it.
+
+Usage: python site_archive.py serve ARCHIVE [--port 8000] [--bind 127.0.0.1]
+       python site_archive.py ls ARCHIVE
+"""
+
+import os
+import sys
+import mmap
+import time
+import struct
+import zipfile
+import argparse
+import mimetypes
+from urllib.parse import unquote, urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import publish
+import precompress
+from atomic_io import temp_path
+from shared_assets import IMMUTABLE_DIRS
+
+# Local file header: fixed part, then the name and extra field lengths at offset 26
+LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+def with_siblings(relpath, data, encodings=()):
+    """[(relpath, data)] plus the precompressed siblings of a servable file
+
+    As with precompress.py, an encoding is kept only if it makes the file smaller.
+    """
+    members = [(relpath, data)]
+    if precompress.is_compressible(os.path.basename(relpath)):
+        for encoding in encodings:
+            encoded = precompress.compress(data, encoding)
+            if len(encoded) < len(data):
+                members.append((relpath + precompress.SUFFIXES[encoding], encoded))
+    return members
+
+
+class ArchiveOutput:
+    """Build output that queues files for the archive instead of writing them
+
+    Pool workers get a pickled copy: write() and write_shared() queue (relpath, bytes,
+    shared) triples, and build_record() returns them from drain() for the parent to
+    commit() to the archive. Course files are queued with their compressed siblings;
+    shared modules, which many courses queue, are compressed by commit() for their
+    first copy only. Every course is packed afresh, so size() reports nothing on disk.
+    """
+
+    def __init__(self, encodings=(), writer=None):
+        self.encodings = list(encodings)
+        self.writer = writer
+        self.pending = []
+
+    def __getstate__(self):
+        # The open archive stays in the parent
+        return dict(self.__dict__, writer=None, pending=[])
+
+    def size(self, relpath):
+        """Nothing is on disk to compare against"""
+        return None
+
+    def write(self, relpath, data):
+        """Queue one output file"""
+        self.pending += [(name, member, False) for name, member in with_siblings(relpath, data, self.encodings)]
+
+    def write_shared(self, relpath, data):
+        """Queue a content-addressed file; the writer keeps only the first copy"""
+        self.pending.append((relpath, data, True))
+        return True
+
+    def remove(self, relpath):
+        """Nothing to remove from an archive built afresh"""
+
+    def remove_dir(self, relpath):
+        """Nothing to remove from an archive built afresh"""
+
+    def list_dir(self, relpath):
+        """An archive built afresh holds no stale files"""
+        return []
+
+    def drain(self):
+        """Take the queued files"""
+        pending, self.pending = self.pending, []
+        return pending
+
+    def commit(self, members):
+        """Append drained files to the archive (parent process only)"""
+        for relpath, data, shared in members:
+            if not shared:
+                self.writer.add(relpath, data)
+            elif relpath not in self.writer.names:
+                for name, member in with_siblings(relpath, data, self.encodings):
+                    self.writer.add(name, member)
+
+
+class ArchiveWriter:
+    """Appends stored members to a zip, replacing `path` atomically on close"""
+
+    def __init__(self, path, mtime=None):
+        self.path = path
+        self.tmp_path = temp_path(path)
+        self.date_time = time.gmtime(mtime if mtime is not None else time.time())[:6]
+        self.zip = zipfile.ZipFile(self.tmp_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+        self.names = set()
+        self.bytes = 0
+
+    def add(self, relpath, data):
+        """Store one member unless a member of that name is already in"""
+        if relpath in self.names:
+            return
+        info = zipfile.ZipInfo(relpath, date_time=max(self.date_time, (1980, 1, 1, 0, 0, 0)))
+        info.compress_type = zipfile.ZIP_STORED
+        info.external_attr = 0o644 << 16
+        self.zip.writestr(info, data)
+        self.names.add(relpath)
+        self.bytes += len(data)
+
+    def add_tree(self, root, relpaths, encodings=()):
+        """Store files under root, with precompressed siblings, in the given order"""
+        for relpath in relpaths:
+            with open(os.path.join(root, *relpath.split('/')), 'rb') as f:
+                data = f.read()
+            for name, member in with_siblings(relpath, data, encodings):
+                self.add(name, member)
+
+    def close(self):
+        """Write the central directory and move the archive into place"""
+        self.zip.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        """Abandon a partly written archive, leaving any previous one in place"""
+        try:
+            self.zip.close()
+        finally:
+            try:
+                os.remove(self.tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+def site_relpaths(root, skip=()):
+    """Sorted relative paths of the servable files under root, dotfiles and `skip` excluded"""
+    relpaths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+        for name in filenames:
+            relpath = os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, '/')
+            if not name.startswith('.') and not name.endswith('.tmp') and relpath not in skip:
+                relpaths.append(relpath)
+    return sorted(relpaths)
+
+
+def static_relpaths(source_root):
+    """Relative paths of the hand-written site files present under source_root"""
+    relpaths = [path for path in publish.STATIC_FILES if os.path.isfile(os.path.join(source_root, path))]
+    for directory in publish.STATIC_DIRS:
+        relpaths += [f"{directory}/{path}" for path in site_relpaths(os.path.join(source_root, directory))]
+    return relpaths
+
+
+class SiteArchive:
+    """Read-only view of an archive: member bytes straight from an mmap, by offset"""
+
+    def __init__(self, path):
+        self.path = path
+        with zipfile.ZipFile(path) as archive:
+            self.members = {info.filename: info for info in archive.infolist()}
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = {}
+
+    def locate(self, name):
+        """(offset, size) of a member's bytes, or None if there is no such member"""
+        info = self.members.get(name)
+        if info is None or name.endswith('/'):
+            return None
+        offset = self.offsets.get(name)
+        if offset is None:
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{name} is compressed inside {self.path}; only stored members can be served")
+            header = LOCAL_HEADER.unpack_from(self.map, info.header_offset)
+            if header[0] != LOCAL_HEADER_SIGNATURE:
+                raise ValueError(f"Bad local header for {name} in {self.path}")
+            offset = info.header_offset + LOCAL_HEADER.size + header[-2] + header[-1]
+            self.offsets[name] = offset
+        return offset, info.file_size
+
+    def read(self, name):
+        """A member's bytes as a memoryview into the archive, or None"""
+        location = self.locate(name)
+        if location is None:
+            return None
+        offset, size = location
+        return memoryview(self.map)[offset:offset + size]
+
+    def close(self):
+        """Release the mapping"""
+        self.map.close()
+        self.file.close()
+
+
+def accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header; x-gzip counts as gzip"""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, *params = [piece.strip() for piece in part.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        accepted['gzip' if coding == 'x-gzip' else coding] = q
+    return accepted
+
+
+def acceptable(accepted, encoding):
+    """Whether a client's accepted codings allow `encoding`, explicitly or through '*'"""
+    return accepted.get(encoding, accepted.get('*', 0)) > 0
+
+
+def make_handler(site):
+    """A request handler class serving members of a SiteArchive"""
+
+    class ArchiveHandler(BaseHTTPRequestHandler):
+        server_version = "SiteArchive/1"
+
+        def resolve(self):
+            """(member name, redirect location) for the request path"""
+            name = unquote(urlsplit(self.path).path).lstrip('/')
+            if name == '' or name.endswith('/'):
+                return name + 'index.html', None
+            if name not in site.members and f"{name}/index.html" in site.members:
+                # Course pages use relative links, so directories need their slash
+                return None, '/' + name + '/'
+            return name, None
+
+        def send_member(self, head_only):
+            name, redirect = self.resolve()
+            if redirect:
+                self.send_response(301)
+                self.send_header('Location', redirect)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if name not in site.members:
+                self.send_error(404)
+                return
+
+            served, encoding = name, None
+            accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+            for candidate, suffix in precompress.SUFFIXES.items():
+                if acceptable(accepted, candidate) and name + suffix in site.members:
+                    served, encoding = name + suffix, candidate
+                    break
+            data = site.read(served)
+
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+                content_type += '; charset=utf-8'
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            if precompress.is_compressible(name):
+                self.send_header('Vary', 'Accept-Encoding')
+            if name.startswith(tuple(IMMUTABLE_DIRS)):
+                self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            self.end_headers()
+            if not head_only:
+                self.wfile.write(data)
+
+        def do_GET(self):
+            self.send_member(head_only=False)
+
+        def do_HEAD(self):
+            self.send_member(head_only=True)
+
+    return ArchiveHandler
+
+
+def serve(path, port=8000, bind='127.0.0.1'):
+    """Serve an archive over HTTP until interrupted"""
+    site = SiteArchive(path)
+    server = ThreadingHTTPServer((bind, port), make_handler(site))
+    print(f"🌐 Serving {len(site.members)} members of {path} at http://{bind}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopped serving")
+    finally:
+        server.server_close()
+        site.close()
+
+
+def main(argv=None):
+    """Serve or list an archive"""
+    parser = argparse.ArgumentParser(description="Serve a course site archive without extracting it")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help="serve the archive over HTTP")
+    serve_parser.add_argument('archive')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--bind', default='127.0.0.1')
+    list_parser = commands.add_parser('ls', help="list members with their offsets and sizes")
+    list_parser.add_argument('archive')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.archive, args.port, args.bind)
+        return
+    site = SiteArchive(args.archive)
+    for name in sorted(site.members):
+        location = site.locate(name)
+        if location:
+            print(f"{location[0]:>12} {location[1]:>10}  {name}")
+    print(f"📦 {len(site.members)} members, {os.path.getsize(args.archive) / 1024:.1f} KB", file=sys.stderr)
+    site.close()
+
+
+if __name__ == '__main__':
+    main()